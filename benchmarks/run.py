@@ -0,0 +1,336 @@
+"""Render, dispatch and input benchmarks for lokutui, run headless.
+
+    python -m benchmarks.run                     # every benchmark, JSON on stdout
+    python -m benchmarks.run -k list -k chart    # names containing "list" or "chart"
+    python -m benchmarks.run -o results.json     # write the JSON report to a file
+    python -m benchmarks.run --compare old.json  # also print the change against an earlier report
+
+Each benchmark times one operation many times on a Screen backed by HeadlessBackend, so no
+terminal is needed. Times are in milliseconds; compare reports from the same machine only.
+"""
+from __future__ import annotations
+import argparse
+import curses
+import itertools
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from array import array
+
+from lokutui import Screen, HeadlessBackend, EventDispatcher, CustomEvent, ChartSeries
+from lokutui.events import _global_event_queue
+from lokutui.widgets import (
+    Label, Box, Frame, Button, TextInput, List, Select, Checkbox, VStack, HStack, Dialog,
+    FormDialog, LogDisplay, ProgressBar, Chart,
+)
+
+HEIGHT, WIDTH = 50, 160
+_BENCHMARKS: list[tuple[str, callable]] = []
+
+
+def benchmark(name: str):
+    def register(func):
+        _BENCHMARKS.append((name, func))
+        return func
+    return register
+
+
+def _reset_dispatcher() -> None:
+    dispatcher = EventDispatcher()
+    dispatcher.handlers.clear()
+    dispatcher.batch_handlers.clear()
+    dispatcher._coalescing.clear()
+    _global_event_queue.clear()
+
+
+def _screen(*widgets) -> tuple[Screen, HeadlessBackend]:
+    _reset_dispatcher()
+    backend = HeadlessBackend(HEIGHT, WIDTH)
+    screen = Screen(backend=backend)
+    for widget in widgets:
+        screen.add_widget(widget)
+    screen.step()
+    return screen, backend
+
+
+def _time(operation: callable, repeat: int) -> list[float]:
+    samples = []
+    clock = time.perf_counter
+    for _ in range(repeat):
+        start = clock()
+        operation()
+        samples.append((clock() - start) * 1e3)
+    return samples
+
+
+def _frames(screen: Screen, mutate: callable, repeat: int) -> list[float]:
+    # Time of mutate() plus the frame that draws it.
+    def frame():
+        mutate()
+        screen.step()
+    return _time(frame, repeat)
+
+
+def _full_frames(screen: Screen, repeat: int) -> list[float]:
+    def frame():
+        screen.refresh()
+        screen.step()
+    return _time(frame, repeat)
+
+
+def _keystrokes(screen: Screen, backend: HeadlessBackend, keys: list, repeat: int) -> list[float]:
+    # Keystroke-to-frame latency: from feeding a key to the end of the frame showing its effect.
+    next_key = itertools.cycle(keys).__next__
+
+    def keystroke():
+        backend.feed(next_key())
+        screen.step()
+    return _time(keystroke, repeat)
+
+
+def _widget_frames(widget, mutate: callable, repeat: int) -> dict[str, list[float]]:
+    screen, _ = _screen(widget)
+    results = {'full': _full_frames(screen, repeat), 'update': _frames(screen, mutate, repeat)}
+    screen.stop()
+    return results
+
+
+@benchmark('label')
+def bench_label(repeat):
+    label = Label('status: ok', 2, 2, width=60)
+    toggle = iter(range(10 ** 9))
+    return _widget_frames(label, lambda: setattr(label, 'text', f'status: {next(toggle)}'), repeat)
+
+
+@benchmark('box')
+def bench_box(repeat):
+    box = Box(0, 0, WIDTH, HEIGHT)
+    return _widget_frames(box, lambda: setattr(box, 'width', WIDTH - 1 if box.width == WIDTH else WIDTH), repeat)
+
+
+@benchmark('frame')
+def bench_frame(repeat):
+    frame = Frame('metrics', 0, 0, WIDTH, HEIGHT)
+    counter = iter(range(10 ** 9))
+    return _widget_frames(frame, lambda: setattr(frame, 'title', f'metrics {next(counter)}'), repeat)
+
+
+@benchmark('button')
+def bench_button(repeat):
+    button = Button('Submit', 2, 2)
+    return _widget_frames(button, lambda: setattr(button, 'focused', not button.focused), repeat)
+
+
+@benchmark('text_input')
+def bench_text_input(repeat):
+    field = TextInput('', 2, 2, width=60)
+    screen, backend = _screen(field)
+    screen.focus_manager.focus(field)
+    results = {'full': _full_frames(screen, repeat), 'keystroke': _keystrokes(screen, backend, list('lorem ipsum '), repeat)}
+    screen.stop()
+    return results
+
+
+@benchmark('list_100k')
+def bench_list(repeat):
+    items = [f'row {i:06d} {"x" * (i % 40)}' for i in range(100_000)]
+    lst = List(items, 0, 0, width=80, height=HEIGHT - 1)
+    screen, backend = _screen(lst)
+    screen.focus_manager.focus(lst)
+    results = {
+        'full': _full_frames(screen, repeat),
+        'keystroke_down': _keystrokes(screen, backend, [curses.KEY_DOWN], repeat),
+    }
+    backend.feed('/')
+    screen.step()
+    results['filter_keystroke'] = _keystrokes(screen, backend, list('row 0') + [curses.KEY_BACKSPACE] * 5, repeat)
+    screen.stop()
+    return results
+
+
+@benchmark('select')
+def bench_select(repeat):
+    select = Select([f'option {i}' for i in range(20)], 2, 2, width=30)
+    screen, backend = _screen(select)
+    screen.focus_manager.focus(select)
+    results = {'full': _full_frames(screen, repeat), 'keystroke': _keystrokes(screen, backend, [curses.KEY_RIGHT], repeat)}
+    screen.stop()
+    return results
+
+
+@benchmark('checkbox')
+def bench_checkbox(repeat):
+    box = Checkbox('enabled', 2, 2)
+    return _widget_frames(box, lambda: setattr(box, 'checked', not box.checked), repeat)
+
+
+@benchmark('vstack_200')
+def bench_vstack(repeat):
+    labels = [Label(f'line {i}', width=40) for i in range(200)]
+    stack = VStack(labels, 0, 0)
+    counter = iter(range(10 ** 9))
+    return _widget_frames(stack, lambda: setattr(labels[7], 'text', f'line 7: {next(counter)}'), repeat)
+
+
+@benchmark('hstack_20')
+def bench_hstack(repeat):
+    buttons = [Button(f'btn{i}') for i in range(20)]
+    stack = HStack(buttons, 0, 0)
+    return _widget_frames(stack, lambda: setattr(buttons[3], 'focused', not buttons[3].focused), repeat)
+
+
+@benchmark('dialog')
+def bench_dialog(repeat):
+    screen, backend = _screen(Label('background', 0, 0))
+    # YES/NO, so LEFT/RIGHT move the focus between the buttons.
+    screen.modal = Dialog('Confirm', 'Delete 42 files?', on_yes=lambda: None, on_no=lambda: None)
+    screen.step()
+    results = {'full': _full_frames(screen, repeat), 'keystroke': _keystrokes(screen, backend, [curses.KEY_LEFT, curses.KEY_RIGHT], repeat)}
+    screen.stop()
+    return results
+
+
+@benchmark('form_dialog_50')
+def bench_form_dialog(repeat):
+    fields = []
+    for i in range(50):
+        kind = i % 3
+        widget = TextInput(f'value {i}') if kind == 0 else Checkbox(f'flag {i}') if kind == 1 else Select(['a', 'b', 'c'])
+        fields.append((f'field {i}', widget))
+    screen, backend = _screen(Label('background', 0, 0))
+    screen.modal = FormDialog('Settings', fields, on_save=lambda: None, on_cancel=lambda: None)
+    screen.step()
+    results = {
+        'full': _full_frames(screen, repeat),
+        'keystroke_tab': _keystrokes(screen, backend, ['\t'], repeat),
+        'keystroke_type': _keystrokes(screen, backend, ['\t', 'x'], repeat),
+    }
+    screen.stop()
+    return results
+
+
+@benchmark('log_display_full')
+def bench_log_display(repeat):
+    log = LogDisplay(0, 0, WIDTH, HEIGHT, max_messages=10_000)
+    log.add_messages([f'\x1b[3{i % 8}m{i:08d}\x1b[0m worker-{i % 16} processed request {i * 7} in {i % 97} ms' for i in range(10_000)])
+    counter = iter(range(10 ** 9))
+    results = _widget_frames(log, lambda: log.add_message(f'\x1b[32mINFO\x1b[0m appended {next(counter)}'), repeat)
+    lines = [f'plain line {i} with some payload text' for i in range(100)]
+    screen, _ = _screen(log)
+    results['ingest_100_lines'] = _frames(screen, lambda: log.add_messages(lines), repeat)
+    screen.stop()
+    return results
+
+
+@benchmark('progress_bar')
+def bench_progress_bar(repeat):
+    bar = ProgressBar(0, 0, width=WIDTH)
+    counter = iter(range(10 ** 9))
+    return _widget_frames(bar, lambda: setattr(bar, 'percentage', next(counter) % 1000 / 1000), repeat)
+
+
+@benchmark('chart_1m')
+def bench_chart(repeat):
+    values = array('d', (math.sin(i / 5000) * 100 + (i % 1000 == 0) * 50 for i in range(1_000_000)))
+    series = ChartSeries(1_000_000, values)
+    chart = Chart(0, 0, WIDTH, HEIGHT)
+    chart.set_series('signal', series)
+    chart.set_series('baseline', ChartSeries(1000, (50.0 for _ in range(1000))))
+    counter = iter(range(10 ** 9))
+    return _widget_frames(chart, lambda: chart.add_point('signal', math.sin(next(counter) / 50) * 100), repeat)
+
+
+@benchmark('dispatch')
+def bench_dispatch(repeat):
+    screen, _ = _screen()
+    dispatcher = screen.event_dispatcher
+    received = [0]
+    for i in range(5):
+        dispatcher.register_handler('metric', lambda event: received.__setitem__(0, received[0] + 1))
+    events = [CustomEvent('metric', {'name': f'm{i % 50}', 'value': i}) for i in range(10_000)]
+
+    def drain():
+        _global_event_queue.extend(events)
+        screen._process_events()
+    results = {'10k_events': _time(drain, repeat)}
+    dispatcher.set_coalescing('metric', key='name')
+    results['10k_events_coalesced'] = _time(drain, repeat)
+    screen.stop()
+    return results
+
+
+def _summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        'iterations': len(samples),
+        'mean_ms': statistics.fmean(samples),
+        'median_ms': statistics.median(samples),
+        'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'min_ms': ordered[0],
+        'max_ms': ordered[-1],
+    }
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(patterns: list[str] | None = None, repeat: int = 50) -> dict:
+    results = {}
+    for name, func in _BENCHMARKS:
+        if patterns and not any(p in name for p in patterns):
+            continue
+        for case, samples in func(repeat).items():
+            results[f'{name}.{case}'] = _summary(samples)
+    return {
+        'meta': {
+            'commit': _commit(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'timestamp': time.time(),
+            'repeat': repeat,
+            'terminal': [HEIGHT, WIDTH],
+        },
+        'results': results,
+    }
+
+
+def compare(report: dict, baseline: dict) -> list[str]:
+    lines = []
+    for name, result in report['results'].items():
+        old = baseline.get('results', {}).get(name)
+        if old is None:
+            continue
+        change = (result['median_ms'] - old['median_ms']) / old['median_ms'] * 100 if old['median_ms'] else 0.0
+        lines.append(f"{name:40} {old['median_ms']:10.3f} -> {result['median_ms']:10.3f} ms  {change:+7.1f}%")
+    return lines
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', dest='patterns', action='append', help='only run benchmarks whose name contains this')
+    parser.add_argument('-n', '--repeat', type=int, default=50, help='iterations per case (default 50)')
+    parser.add_argument('-o', '--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--compare', help='earlier JSON report to compare medians against (printed to stderr)')
+    args = parser.parse_args(argv)
+    report = run(args.patterns, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare) as f:
+            print('\n'.join(compare(report, json.load(f))), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
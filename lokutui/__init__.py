@@ -1,11 +1,17 @@
 from .core import Screen, Widget
-from .events import Event, EventDispatcher, CustomEvent, MouseEvent, create_key_event
+from .buffer import CellBuffer, Pad
+from .backend import Backend, CursesBackend, HeadlessBackend, VirtualTerminal
+from .focus import FocusManager
+from .streams import LogStream
+from .series import ChartSeries
+from .events import Event, EventDispatcher, CustomEvent, MouseEvent, create_key_event, create_paste_event
 from .widgets._widgets import (
 	Label,
 	Box,
 	Button,
 	TextInput,
 	List,
+	ListDataSource,
 	Select,
 	Checkbox,
 	VStack,
@@ -21,16 +27,27 @@ from .widgets._widgets import (
 __all__ = [
 	"Screen",
 	"Widget",
+	"CellBuffer",
+	"Pad",
+	"Backend",
+	"CursesBackend",
+	"HeadlessBackend",
+	"VirtualTerminal",
+	"FocusManager",
+	"LogStream",
+	"ChartSeries",
 	"Event",
 	"EventDispatcher",
 	"CustomEvent",
 	"MouseEvent",
 	"create_key_event",
+	"create_paste_event",
 	"Label",
 	"Box",
 	"Button",
 	"TextInput",
 	"List",
+	"ListDataSource",
 	"Select",
 	"Checkbox",
 	"VStack",
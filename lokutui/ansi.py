@@ -0,0 +1,112 @@
+from __future__ import annotations
+import curses
+import re
+from lokutui.colors import registry, rgb_to_256
+
+_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[([0-?]*)[ -/]*([@-~]))')
+
+_SGR_SET = {
+    1: curses.A_BOLD, 2: curses.A_DIM, 3: getattr(curses, 'A_ITALIC', 0), 4: curses.A_UNDERLINE,
+    5: curses.A_BLINK, 7: curses.A_REVERSE,
+}
+_SGR_CLEAR = {
+    22: curses.A_BOLD | curses.A_DIM, 23: getattr(curses, 'A_ITALIC', 0), 24: curses.A_UNDERLINE,
+    25: curses.A_BLINK, 27: curses.A_REVERSE,
+}
+
+# A style is (fg, bg, attrs): fg/bg are xterm-256 indices or -1 for the terminal default, attrs
+# are curses attribute bits. Styles are interned to small ids so runs stay compact.
+DEFAULT_STYLE = (-1, -1, 0)
+_style_ids: dict[tuple[int, int, int], int] = {DEFAULT_STYLE: 0}
+_styles: list[tuple[int, int, int]] = [DEFAULT_STYLE]
+
+
+def _style_id(style: tuple[int, int, int]) -> int:
+    sid = _style_ids.get(style)
+    if sid is None:
+        sid = _style_ids[style] = len(_styles)
+        _styles.append(style)
+    return sid
+
+
+def _apply_sgr(style: tuple[int, int, int], params: str) -> tuple[int, int, int]:
+    fg, bg, attrs = style
+    try:
+        codes = [int(p) if p else 0 for p in params.replace(':', ';').split(';')]
+    except ValueError:
+        return style
+    i, n = 0, len(codes)
+    while i < n:
+        code = codes[i]
+        if code == 0:
+            fg, bg, attrs = DEFAULT_STYLE
+        elif code in _SGR_SET:
+            attrs |= _SGR_SET[code]
+        elif code in _SGR_CLEAR:
+            attrs &= ~_SGR_CLEAR[code]
+        elif 30 <= code <= 37:
+            fg = code - 30
+        elif 40 <= code <= 47:
+            bg = code - 40
+        elif 90 <= code <= 97:
+            fg = code - 82
+        elif 100 <= code <= 107:
+            bg = code - 92
+        elif code == 39:
+            fg = -1
+        elif code == 49:
+            bg = -1
+        elif code in (38, 48):
+            if i + 2 < n and codes[i + 1] == 5:
+                color = codes[i + 2] & 255
+                i += 2
+            elif i + 4 < n and codes[i + 1] == 2:
+                color = rgb_to_256(*(min(255, c) for c in codes[i + 2:i + 5]))
+                i += 4
+            else:
+                break
+            if code == 38:
+                fg = color
+            else:
+                bg = color
+        i += 1
+    return (fg, bg, attrs)
+
+
+# (style id, SGR parameters) -> resulting style id, so repeated sequences skip parsing.
+_transitions: dict[tuple[int, str], int] = {}
+
+
+def parse_ansi(line: str) -> tuple[str, tuple[int, ...] | None]:
+    # Strips escape sequences and returns the plain text plus its SGR styling as a flat tuple
+    # (length, style id, length, style id, ...), or None when the line is unstyled.
+    if '\x1b' not in line:
+        return line, None
+    # split() yields text, params, final byte, text, params, final byte, ..., text.
+    pieces = _ESCAPE.split(line)
+    texts = pieces[::3]
+    runs: list[int] = []
+    sid = 0
+    styled = False
+    for i, text in enumerate(texts):
+        if i:
+            if pieces[3 * i - 1] == 'm':
+                key = (sid, pieces[3 * i - 2])
+                sid = _transitions.get(key)
+                if sid is None:
+                    sid = _transitions[key] = _style_id(_apply_sgr(_styles[key[0]], key[1]))
+        if text:
+            if runs and runs[-1] == sid:
+                runs[-2] += len(text)
+            else:
+                runs += (len(text), sid)
+                styled = styled or sid != 0
+    text = ''.join(texts)
+    return text, tuple(runs) if styled else None
+
+
+def style_attr(sid: int) -> int:
+    # Curses attribute for a style id, from the color registry. Styles with default colors carry
+    # no color bits, so the caller can OR in its own color pair when `attr & curses.A_COLOR` is zero.
+    fg, bg, attrs = _styles[sid]
+    return registry.attr(fg, bg, attrs)
@@ -0,0 +1,342 @@
+from __future__ import annotations
+import curses
+import os
+import select
+import sys
+from collections import deque
+from collections.abc import Iterable
+from lokutui.buffer import CellBuffer, _cells
+
+_PASTE_START = '\x1b[200~'
+_PASTE_END = '\x1b[201~'
+
+
+# What Screen needs from a terminal. `window` is what the frame buffer is flushed to (anything
+# with addstr(y, x, text, attr) and move(y, x)); keys are curses key codes.
+class Backend:
+    window: object = None
+    colors: int = 0
+    color_pairs: int = 0
+
+    def start(self, bracketed_paste: bool = True) -> None:
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        raise NotImplementedError
+
+    def size(self) -> tuple[int, int]:
+        raise NotImplementedError
+
+    def read_keys(self) -> list[int]:
+        raise NotImplementedError
+
+    def refresh(self) -> None:
+        pass
+
+    # Descriptor the event loop selects on for input, or None.
+    def fileno(self) -> int | None:
+        return None
+
+    # Input wait in milliseconds for read_keys; 0 never blocks (event-driven loop).
+    def input_timeout(self, milliseconds: int) -> None:
+        pass
+
+    # Re-read the terminal size after SIGWINCH.
+    def update_size(self) -> None:
+        pass
+
+    def has_colors(self) -> bool:
+        return self.colors > 0
+
+    def init_pair(self, pair: int, fg: int, bg: int) -> None:
+        pass
+
+    def color_pair(self, pair: int) -> int:
+        return (pair << 8) & curses.A_COLOR
+
+    def curs_set(self, visibility: int) -> None:
+        pass
+
+
+class CursesBackend(Backend):
+    def __init__(self):
+        self.window = None
+        self._timeout: int = 16
+        self._bracketed_paste: bool = False
+
+    def start(self, bracketed_paste: bool = True) -> None:
+        os.environ.setdefault('ESCDELAY', '25')
+        self.window = curses.initscr()
+        curses.noecho()
+        curses.cbreak()
+        self.window.keypad(True)
+        self.input_timeout(16)
+        curses.curs_set(0)
+        curses.start_color()
+        curses.use_default_colors()
+        curses.init_pair(1, curses.COLOR_WHITE, -1)
+        curses.init_pair(2, curses.COLOR_CYAN, -1)
+        curses.init_pair(3, curses.COLOR_YELLOW, -1)
+        curses.init_pair(4, curses.COLOR_RED, -1)
+        self.colors, self.color_pairs = curses.COLORS, curses.COLOR_PAIRS
+        self._bracketed_paste = bracketed_paste
+        if bracketed_paste:
+            sys.stdout.write('\x1b[?2004h')
+            sys.stdout.flush()
+
+    def stop(self) -> None:
+        if self.window:
+            if self._bracketed_paste:
+                sys.stdout.write('\x1b[?2004l')
+                sys.stdout.flush()
+            curses.curs_set(1)
+            self.window.keypad(False)
+            curses.echo()
+            curses.nocbreak()
+            curses.endwin()
+            self.window = None
+
+    def size(self) -> tuple[int, int]:
+        return self.window.getmaxyx()
+
+    def fileno(self) -> int | None:
+        return sys.stdin.fileno()
+
+    def input_timeout(self, milliseconds: int) -> None:
+        self._timeout = milliseconds
+        self.window.timeout(milliseconds)
+
+    def read_keys(self) -> list[int]:
+        keys: list[int] = []
+        window = self.window
+        try:
+            key = window.getch()
+            if key == -1:
+                return keys
+            # The first read may wait for the poll timeout; everything already buffered is read without waiting.
+            if self._timeout:
+                window.nodelay(True)
+            try:
+                while key != -1:
+                    keys.append(key)
+                    key = window.getch()
+            finally:
+                if self._timeout:
+                    window.timeout(self._timeout)
+        except curses.error:
+            pass
+        return keys
+
+    def refresh(self) -> None:
+        # One doupdate() per frame pushes everything marked with noutrefresh at once.
+        self.window.noutrefresh()
+        curses.doupdate()
+
+    def update_size(self) -> None:
+        try:
+            size = os.get_terminal_size(sys.stdout.fileno())
+            curses.resizeterm(size.lines, size.columns)
+        except (OSError, curses.error):
+            pass
+
+    def has_colors(self) -> bool:
+        return curses.has_colors()
+
+    def init_pair(self, pair: int, fg: int, bg: int) -> None:
+        curses.init_pair(pair, fg, bg)
+
+    def color_pair(self, pair: int) -> int:
+        return curses.color_pair(pair)
+
+    def curs_set(self, visibility: int) -> None:
+        try: curses.curs_set(visibility)
+        except curses.error: pass
+
+
+# The character/attribute grid a HeadlessBackend draws into. Besides the CellBuffer drawing API it
+# counts writes and frames and can be inspected as text.
+class VirtualTerminal(CellBuffer):
+    def __init__(self, height: int, width: int):
+        super().__init__(height, width)
+        self.writes: int = 0
+        self.frames: int = 0
+        self.cursor_visible: bool = False
+
+    def addstr(self, *args) -> None:
+        self.writes += 1
+        super().addstr(*args)
+
+    def refresh(self) -> None:
+        self.frames += 1
+
+    def snapshot(self) -> list[str]:
+        return [self.row_text(y) for y in range(self.height)]
+
+    def styled_row(self, y: int) -> list[tuple[str, int]]:
+        # The row as (text, attr) runs.
+        runs: list[tuple[str, int]] = []
+        start = y * self.width
+        attrs = self._attrs
+        x = 0
+        text = self._row_cells(y)
+        while x < self.width:
+            end, attr = x + 1, attrs[start + x]
+            while end < self.width and attrs[start + end] == attr:
+                end += 1
+            runs.append((text[x:end].replace('\0', ''), attr))
+            x = end
+        return runs
+
+    def attr_at(self, y: int, x: int) -> int:
+        return self._attrs[y * self.width + x]
+
+    def find(self, text: str) -> tuple[int, int] | None:
+        # Positions are columns, so the text is laid out in cells like the rows are.
+        text = _cells(text)
+        for y in range(self.height):
+            x = self._row_cells(y).find(text)
+            if x >= 0:
+                return (y, x)
+        return None
+
+    def __str__(self) -> str:
+        return '\n'.join(self.snapshot())
+
+
+# Runs a Screen without a terminal: frames go to a VirtualTerminal and input comes from feed().
+# A pipe signals fed input, so event-driven loops wake up for it as they would for a keyboard.
+class HeadlessBackend(Backend):
+    def __init__(self, height: int = 24, width: int = 80, colors: int = 256, color_pairs: int = 256):
+        self.terminal = VirtualTerminal(height, width)
+        self.window = self.terminal
+        self.colors, self.color_pairs = colors, color_pairs
+        self.pairs: dict[int, tuple[int, int]] = {}
+        self._input: deque[int] = deque()
+        self._pipe: tuple[int, int] | None = None
+        # No waiting by default, so step() never blocks; a polling run() sets one frame interval.
+        self._timeout: int = 0
+
+    def start(self, bracketed_paste: bool = True) -> None:
+        if self._pipe is None:
+            r, w = os.pipe()
+            os.set_blocking(r, False)
+            os.set_blocking(w, False)
+            self._pipe = (r, w)
+        for pair, (fg, bg) in ((1, (curses.COLOR_WHITE, -1)), (2, (curses.COLOR_CYAN, -1)), (3, (curses.COLOR_YELLOW, -1)), (4, (curses.COLOR_RED, -1))):
+            self.pairs.setdefault(pair, (fg, bg))
+        if self._input:
+            self._signal()
+
+    def stop(self) -> None:
+        if self._pipe is not None:
+            for fd in self._pipe:
+                os.close(fd)
+            self._pipe = None
+
+    def size(self) -> tuple[int, int]:
+        return self.terminal.getmaxyx()
+
+    def resize(self, height: int, width: int) -> None:
+        # The screen notices the new size on its next frame and redraws everything.
+        self.terminal.resize(height, width)
+
+    def fileno(self) -> int | None:
+        return self._pipe[0] if self._pipe is not None else None
+
+    def input_timeout(self, milliseconds: int) -> None:
+        self._timeout = milliseconds
+
+    def _signal(self) -> None:
+        try:
+            os.write(self._pipe[1], b'\0')
+        except (BlockingIOError, TypeError):
+            pass
+
+    def feed(self, *keys: int | str | Iterable[int | str]) -> None:
+        # Queues input for the next read: key codes, or strings typed one character at a time.
+        for key in keys:
+            if isinstance(key, str):
+                self._input.extend(ord(c) for c in key)
+            elif isinstance(key, int):
+                self._input.append(key)
+            else:
+                self.feed(*key)
+        if self._pipe is not None:
+            self._signal()
+
+    def paste(self, text: str) -> None:
+        self.feed(_PASTE_START, *text.encode('utf-8'), _PASTE_END)
+
+    @property
+    def pending_input(self) -> int:
+        return len(self._input)
+
+    def read_keys(self) -> list[int]:
+        if not self._input and self._timeout > 0 and self._pipe is not None:
+            # Wait like a curses read with a timeout; feed() from another thread wakes it.
+            select.select([self._pipe[0]], [], [], self._timeout / 1000)
+        if self._pipe is not None:
+            try:
+                while os.read(self._pipe[0], 4096):
+                    pass
+            except BlockingIOError:
+                pass
+        keys = list(self._input)
+        self._input.clear()
+        return keys
+
+    def snapshot(self) -> list[str]:
+        return self.terminal.snapshot()
+
+    def init_pair(self, pair: int, fg: int, bg: int) -> None:
+        self.pairs[pair] = (fg, bg)
+
+    def refresh(self) -> None:
+        self.terminal.refresh()
+
+    def curs_set(self, visibility: int) -> None:
+        self.terminal.cursor_visible = bool(visibility)
+
+
+# The backend of the running Screen; the module functions below let widgets use colors and the
+# cursor without knowing which backend that is.
+_active: Backend | None = None
+
+
+def _set_active(backend: Backend | None) -> None:
+    global _active
+    _active = backend
+
+
+def color_pair(pair: int) -> int:
+    if _active is not None:
+        return _active.color_pair(pair)
+    return (pair << 8) & curses.A_COLOR
+
+
+def curs_set(visibility: int) -> None:
+    if _active is not None:
+        _active.curs_set(visibility)
+        return
+    try: curses.curs_set(visibility)
+    except curses.error: pass
+
+
+def init_pair(pair: int, fg: int, bg: int) -> None:
+    if _active is not None:
+        _active.init_pair(pair, fg, bg)
+    else:
+        curses.init_pair(pair, fg, bg)
+
+
+def has_colors() -> bool:
+    if _active is not None:
+        return _active.has_colors()
+    return curses.has_colors()
+
+
+def color_count() -> tuple[int, int]:
+    # (colors, color pairs) the terminal supports.
+    if _active is not None:
+        return _active.colors, _active.color_pairs
+    return curses.COLORS, curses.COLOR_PAIRS
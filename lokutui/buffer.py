@@ -0,0 +1,278 @@
+from __future__ import annotations
+import curses
+import sys
+import unicodedata
+from array import array
+from functools import lru_cache
+
+# Control characters would move the curses cursor mid-run; draw them as blanks instead. Tabs are
+# expanded to the next tab stop.
+_CONTROL_CHARS = {i: ' ' for i in range(32) if i != 9}
+_TAB_SIZE = 8
+
+# A wide (East Asian) character takes two cells: the character, then this continuation cell. It is
+# never written itself and is dropped from text read back. '\0' cannot otherwise occur in the back
+# buffer, since control characters are blanked.
+_CONTINUATION = 0
+
+
+# Cells hold code points; UTF-32 in native byte order maps 1:1 onto array('I') items.
+_CODEC = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+
+def _char_array(text: str) -> array:
+    return array('I', text.encode(_CODEC))
+
+
+def _char_text(chars: array) -> str:
+    return chars.tobytes().decode(_CODEC)
+
+
+@lru_cache(maxsize=4096)
+def _cells(text: str) -> str:
+    # Non-ASCII text laid out one code point per cell.
+    return ''.join(c + '\0' if unicodedata.east_asian_width(c) in 'WF' else c for c in text)
+
+
+def _expand_tabs(text: str, x: int) -> str:
+    # Tab stops are counted from the window's first column, as curses does.
+    lead = x % _TAB_SIZE
+    return (' ' * lead + text).expandtabs(_TAB_SIZE)[lead:]
+
+
+# In-memory char/attribute grid exposing the drawing subset of a curses window. Widgets draw
+# into it as usual; flush() diffs it against the last frame written and emits only changed runs.
+class CellBuffer:
+    def __init__(self, height: int = 0, width: int = 0):
+        self.resize(height, width)
+
+    def resize(self, height: int, width: int) -> None:
+        self.height, self.width = max(0, height), max(0, width)
+        size = self.height * self.width
+        self._chars = _char_array(' ' * size)
+        self._attrs = array('Q', bytes(8 * size))
+        # '\0' never appears in the back buffer, so the first flush writes every cell.
+        self._front_chars = _char_array('\0' * size)
+        self._front_attrs = array('Q', bytes(8 * size))
+        self._dirty_rows = bytearray(b'\x01' * self.height)
+        self.cursor: tuple[int, int] = (0, 0)
+        # Where flush() leaves the terminal cursor: the last move(), not the end of the last write,
+        # so a frame that repaints only some widgets keeps it where the focused one put it.
+        self._cursor_request: tuple[int, int] = (0, 0)
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return (self.height, self.width)
+
+    def getyx(self) -> tuple[int, int]:
+        return self.cursor
+
+    def move(self, y: int, x: int) -> None:
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise curses.error('move() returned ERR')
+        self.cursor = self._cursor_request = (y, x)
+
+    def erase(self) -> None:
+        self.fill(0, 0, self.height, self.width)
+
+    clear = erase
+
+    def fill(self, y: int, x: int, h: int, w: int, char: str = ' ', attr: int = 0) -> None:
+        y0, x0 = max(0, y), max(0, x)
+        y1, x1 = min(self.height, y + h), min(self.width, x + w)
+        if y1 <= y0 or x1 <= x0:
+            return
+        n = x1 - x0
+        chars, attrs = _char_array(char * n), array('Q', (attr,)) * n
+        for row in range(y0, y1):
+            i = row * self.width + x0
+            self._split_wide(i, i + n, row * self.width + self.width)
+            self._chars[i:i + n] = chars
+            self._attrs[i:i + n] = attrs
+            self._dirty_rows[row] = 1
+
+    def _split_wide(self, i: int, j: int, row_end: int) -> None:
+        # Cells i..j-1 are about to be overwritten: blank the other half of any wide character
+        # they cut through.
+        chars = self._chars
+        if chars[i] == _CONTINUATION and i % self.width:
+            chars[i - 1] = 32
+        if j < row_end and chars[j] == _CONTINUATION:
+            chars[j] = 32
+
+    def copy(self) -> CellBuffer:
+        # The drawn cells; the copy has nothing flushed yet.
+        other = CellBuffer(self.height, self.width)
+        other._chars = array('I', self._chars)
+        other._attrs = array('Q', self._attrs)
+        return other
+
+    def blit(self, source: CellBuffer, y: int, x: int, h: int, w: int) -> None:
+        # Copies a rectangle from a buffer of the same size.
+        y0, x0 = max(0, y), max(0, x)
+        y1, x1 = min(self.height, source.height, y + h), min(self.width, x + w)
+        if y1 <= y0 or x1 <= x0 or source.width != self.width:
+            return
+        for row in range(y0, y1):
+            i, j = row * self.width + x0, row * self.width + x1
+            self._chars[i:j] = source._chars[i:j]
+            self._attrs[i:j] = source._attrs[i:j]
+            self._dirty_rows[row] = 1
+
+    def addstr(self, *args) -> None:
+        if isinstance(args[0], str):
+            (y, x), text, attr = self.cursor, args[0], args[1] if len(args) > 1 else 0
+        else:
+            y, x, text = args[0], args[1], args[2]
+            attr = args[3] if len(args) > 3 else 0
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise curses.error('addstr() returned ERR')
+        if text.isascii() and '\t' not in text:
+            text = text[:self.width - x].translate(_CONTROL_CHARS)
+        else:
+            text = text.translate(_CONTROL_CHARS)
+            if not text.isascii():
+                text = _cells(text)
+            if '\t' in text:
+                text = _expand_tabs(text, x)
+        n = min(len(text), self.width - x)
+        if n <= 0:
+            return
+        if n < len(text) and text[n] == '\0':
+            # A wide character cut by the right edge is drawn as a blank, as it would not fit.
+            text = text[:n - 1] + ' '
+        else:
+            text = text[:n]
+        i = y * self.width + x
+        chars = self._chars
+        # Inline _split_wide: this is the hottest drawing call.
+        if x and chars[i] == _CONTINUATION:
+            chars[i - 1] = 32
+        if x + n < self.width and chars[i + n] == _CONTINUATION:
+            chars[i + n] = 32
+        chars[i:i + n] = _char_array(text)
+        self._attrs[i:i + n] = array('Q', (attr,)) * n
+        self._dirty_rows[y] = 1
+        self.cursor = (y, min(x + n, self.width - 1))
+
+    def addnstr(self, y: int, x: int, text: str, n: int, attr: int = 0) -> None:
+        self.addstr(y, x, text[:n], attr)
+
+    def addch(self, y: int, x: int, ch: str | int, attr: int = 0) -> None:
+        self.addstr(y, x, ch if isinstance(ch, str) else chr(ch), attr)
+
+    def hline(self, y: int, x: int, ch: str | int, n: int, attr: int = 0) -> None:
+        self.fill(y, x, 1, n, ch if isinstance(ch, str) else chr(ch), attr)
+
+    def vline(self, y: int, x: int, ch: str | int, n: int, attr: int = 0) -> None:
+        self.fill(y, x, n, 1, ch if isinstance(ch, str) else chr(ch), attr)
+
+    def row_text(self, y: int) -> str:
+        # The row as displayed: a wide character's continuation cell adds nothing.
+        return self._row_cells(y).replace('\0', '')
+
+    def _row_cells(self, y: int) -> str:
+        i = y * self.width
+        return _char_text(self._chars[i:i + self.width])
+
+    def flush(self, window: object) -> int:
+        width = self.width
+        chars, attrs = self._chars, self._attrs
+        front_chars, front_attrs = self._front_chars, self._front_attrs
+        dirty_rows = self._dirty_rows
+        writes = 0
+        for y in range(self.height):
+            if not dirty_rows[y]:
+                continue
+            dirty_rows[y] = 0
+            a, b = y * width, y * width + width
+            if chars[a:b] == front_chars[a:b] and attrs[a:b] == front_attrs[a:b]:
+                continue
+            i = a
+            while i < b:
+                if chars[i] == front_chars[i] and attrs[i] == front_attrs[i]:
+                    i += 1
+                    continue
+                start, attr = i, attrs[i]
+                i += 1
+                while i < b and attrs[i] == attr and (chars[i] != front_chars[i] or attrs[i] != front_attrs[i]):
+                    i += 1
+                run = chars[start:i]
+                text = _char_text(run).replace('\0', '') if _CONTINUATION in run else _char_text(run)
+                if text:
+                    try: window.addstr(y, start - a, text, attr)
+                    except curses.error: pass
+                    writes += 1
+            front_chars[a:b] = chars[a:b]
+            front_attrs[a:b] = attrs[a:b]
+        try: window.move(*self._cursor_request)
+        except curses.error: pass
+        return writes
+
+
+# Off-screen rows of a scrolling widget, in the spirit of a curses pad: each row is drawn once under
+# its row number and show() copies it into the frame, so moving the viewport redraws only the rows
+# that come into view. Rows live in a ring of `capacity` lines (at least a few viewports), so rows
+# far from the viewport are dropped and drawn again if they come back.
+class Pad(CellBuffer):
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        super().__init__(0, 0)
+        self._keys = array('q')
+        self._generation: int = 0
+
+    def prepare(self, width: int, rows: int, generation: int = 0) -> None:
+        # Sizes the pad for a viewport. A new width drops every row, and so does a new generation
+        # (anything the drawn rows depend on but the pad cannot see, such as color pair numbers).
+        height = max(self.capacity, 4 * rows)
+        if width != self.width or height > self.height:
+            self.resize(height, width)
+            self._keys = array('q', [-1]) * height
+        elif generation != self._generation:
+            self.reset()
+        self._generation = generation
+
+    def reset(self) -> None:
+        self._keys = array('q', [-1]) * self.height
+
+    def has(self, row: int) -> bool:
+        return self.height > 0 and self._keys[row % self.height] == row
+
+    def line(self, row: int) -> int:
+        # Blanks the line that will hold `row` and returns its y for drawing into.
+        y = row % self.height
+        self._keys[y] = row
+        self.fill(y, 0, 1, self.width)
+        return y
+
+    def discard(self, row: int) -> None:
+        if self.has(row):
+            self._keys[row % self.height] = -1
+
+    def show(self, row: int, target: object, y: int, x: int) -> None:
+        # Copies a drawn row into the target at (y, x), clipped to the target's width.
+        n = min(self.width, target.getmaxyx()[1] - x)
+        if n <= 0:
+            return
+        i = (row % self.height) * self.width
+        if isinstance(target, CellBuffer):
+            if not (0 <= y < target.height and 0 <= x):
+                raise curses.error('addstr() returned ERR')
+            j = y * target.width + x
+            target._split_wide(j, j + n, y * target.width + target.width)
+            target._chars[j:j + n] = self._chars[i:i + n]
+            target._attrs[j:j + n] = self._attrs[i:i + n]
+            if n < self.width and self._chars[i + n] == _CONTINUATION:
+                target._chars[j + n - 1] = 32
+            target._dirty_rows[y] = 1
+            return
+        # Any other window (a plain curses window) gets the row as attribute runs.
+        attrs, text = self._attrs, _char_text(self._chars[i:i + n])
+        start = 0
+        while start < n:
+            end, attr = start + 1, attrs[i + start]
+            while end < n and attrs[i + end] == attr:
+                end += 1
+            run = text[start:end].replace('\0', '')
+            if run:
+                target.addstr(y, x + start, run, attr)
+            start = end
@@ -0,0 +1,160 @@
+from __future__ import annotations
+import curses
+from collections import OrderedDict
+from lokutui import backend
+
+_NAMES = {
+    'default': -1, 'black': 0, 'red': 1, 'green': 2, 'yellow': 3, 'blue': 4, 'magenta': 5, 'cyan': 6, 'white': 7,
+}
+_NAMES.update({f'bright_{name}': index + 8 for name, index in list(_NAMES.items()) if index >= 0})
+
+# Pairs below this are left to the application (the screen sets up 1-4 itself).
+FIRST_DYNAMIC_PAIR = 16
+# Pair numbers are packed into 8 attribute bits, so higher ones cannot be used through attributes.
+_MAX_PAIRS = 256
+_DIRECT_COLORS = 1 << 24
+
+
+def rgb_to_256(r: int, g: int, b: int) -> int:
+    if r == g == b:
+        if r < 8:
+            return 16
+        if r > 238:
+            return 231
+        return 232 + (r - 8) // 10
+    return 16 + 36 * round(r / 51) + 6 * round(g / 51) + round(b / 51)
+
+
+def _xterm_rgb(color: int) -> tuple[int, int, int]:
+    if color < 16:
+        level = 255 if color >= 8 else 128
+        return (level * (color & 1), level * ((color >> 1) & 1), level * ((color >> 2) & 1))
+    if color >= 232:
+        gray = 8 + 10 * (color - 232)
+        return (gray, gray, gray)
+    color -= 16
+    steps = (0, 95, 135, 175, 215, 255)
+    return (steps[color // 36], steps[(color // 6) % 6], steps[color % 6])
+
+
+def _fit_color(color: int, colors: int) -> int:
+    # An xterm-256 index mapped onto a terminal with fewer colors.
+    if color < colors:
+        return color
+    if color < 16:
+        return color - 8
+    r, g, b = _xterm_rgb(color)
+    return (r > 127) | (g > 127) << 1 | (b > 127) << 2
+
+
+# Maps (fg, bg, attrs) styles to curses attributes. Pairs are allocated on demand from
+# FIRST_DYNAMIC_PAIR up to the terminal's limit; once they run out, the least recently used pair is
+# re-initialised for the new colors and on_evict is called (the screen then redraws everything,
+# since cells already on screen with that pair would change color). Resolved attributes are cached.
+# Colors are xterm-256 indices, -1 for the terminal default, names ('red', 'bright_blue') or
+# '#rrggbb'; truecolor is used as is on direct-color terminals and approximated elsewhere.
+class ColorRegistry:
+    def __init__(self, first_pair: int = FIRST_DYNAMIC_PAIR):
+        self.first_pair = first_pair
+        self.on_evict: callable | None = None
+        self.evictions: int = 0
+        self._pairs: OrderedDict[tuple[int, int], int] = OrderedDict()
+        self._free: list[int] | None = None
+        self._colors: int = 0
+        self._cache: dict[tuple, tuple[int, tuple[int, int] | None]] = {}
+
+    def reset(self) -> None:
+        # Forget every allocation, e.g. when a new terminal session starts.
+        self._pairs.clear()
+        self._cache.clear()
+        self._free = None
+
+    def _setup(self) -> None:
+        try:
+            has_colors = backend.has_colors()
+            colors, pairs = backend.color_count()
+        except (curses.error, AttributeError):
+            has_colors, colors, pairs = False, 0, 0
+        self._colors = colors if has_colors else 0
+        limit = min(pairs, _MAX_PAIRS) if has_colors else 0
+        self._free = list(range(limit - 1, self.first_pair - 1, -1))
+
+    def color(self, spec: int | str) -> int:
+        if isinstance(spec, int):
+            return spec
+        if spec.startswith('#') and len(spec) == 7:
+            r, g, b = int(spec[1:3], 16), int(spec[3:5], 16), int(spec[5:7], 16)
+            if self._colors >= _DIRECT_COLORS:
+                return _DIRECT_COLORS | r << 16 | g << 8 | b
+            return rgb_to_256(r, g, b)
+        return _NAMES[spec.lower()]
+
+    def _terminal_color(self, color: int) -> int:
+        if color < 0:
+            return -1
+        if color & _DIRECT_COLORS:
+            return color & 0xFFFFFF
+        return _fit_color(color, self._colors)
+
+    def pair(self, fg: int, bg: int) -> int:
+        # Pair number for two resolved colors, or 0 when the terminal has no colors.
+        key = (fg, bg)
+        pair = self._pairs.get(key)
+        if pair is not None:
+            self._pairs.move_to_end(key)
+            return pair
+        if self._free is None:
+            self._setup()
+        if self._free:
+            pair = self._free.pop()
+        elif self._pairs:
+            evicted, pair = self._pairs.popitem(last=False)
+            self._cache = {k: v for k, v in self._cache.items() if v[1] != evicted}
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict()
+        else:
+            return 0
+        try:
+            backend.init_pair(pair, self._terminal_color(fg), self._terminal_color(bg))
+        except curses.error:
+            self._free.append(pair)
+            return 0
+        self._pairs[key] = pair
+        return pair
+
+    def attr(self, fg: int | str = -1, bg: int | str = -1, attrs: int = 0) -> int:
+        key = (fg, bg, attrs)
+        cached = self._cache.get(key)
+        if cached is not None:
+            if cached[1] is not None:
+                self._pairs.move_to_end(cached[1])
+            return cached[0]
+        if self._free is None:
+            self._setup()
+        colors = (self.color(fg), self.color(bg))
+        attr, pair_key = attrs, None
+        if colors != (-1, -1):
+            pair = self.pair(*colors)
+            if pair:
+                attr |= backend.color_pair(pair)
+                pair_key = colors
+        self._cache[key] = (attr, pair_key)
+        return attr
+
+
+registry = ColorRegistry()
+
+
+def attr(fg: int | str = -1, bg: int | str = -1, attrs: int = 0) -> int:
+    return registry.attr(fg, bg, attrs)
+
+
+def resolve(spec: int | str | tuple) -> int:
+    # A widget color argument as an attribute: an int is a color pair number as before; a color
+    # (name, '#rrggbb') sets the foreground; a tuple is (fg, bg) or (fg, bg, attrs).
+    if type(spec) is int:
+        return backend.color_pair(spec)
+    if isinstance(spec, str):
+        return registry.attr(spec)
+    return registry.attr(*spec)
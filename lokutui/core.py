@@ -2,133 +2,645 @@ from __future__ import annotations
 import curses
 import time
 import os
+import selectors
+import signal
 from collections import deque
-from lokutui.events import EventDispatcher, create_key_event, _global_event_queue
+from lokutui.buffer import CellBuffer
+from lokutui import backend as backends
+from lokutui import colors
+from lokutui.backend import Backend, CursesBackend, color_pair
+from lokutui import events
+from lokutui import profiler as profiling
+from lokutui.profiler import FrameProfiler
+from lokutui.timers import Timer, TimerQueue
+from lokutui.focus import FocusManager, tree_changed
+from lokutui.events import EventDispatcher, CustomEvent, create_key_event, create_paste_event, _global_event_queue
+
+_UNSET = object()
+_PASTE_START = [27, ord('['), ord('2'), ord('0'), ord('0'), ord('~')]
+_PASTE_END = [27, ord('['), ord('2'), ord('0'), ord('1'), ord('~')]
+# How long the rest of a split paste marker may take to arrive; the ESCDELAY the backend sets.
+_MARKER_WAIT = 0.025
+_SCALAR_TYPES = (int, float, str, bool, type(None))
+
+
+def _intersects(bounds: tuple[int, int, int, int] | None, damage: list[tuple[int, int, int, int]]) -> bool:
+    if bounds is None:
+        return False
+    y, x, h, w = bounds
+    for dy, dx, dh, dw in damage:
+        if y < dy + dh and dy < y + h and x < dx + dw and dx < x + w:
+            return True
+    return False
+
+
+# Decides when the next frame may be drawn. Frames follow the target interval; one that takes longer
+# than the budget pushes the next one out by its own cost, so under overload at least half the time
+# goes to input and events and the skipped frames are counted instead of queued up.
+class _FramePacer:
+    def __init__(self, interval: float, budget: float | None = None):
+        self.interval = interval
+        self.budget = budget if budget is not None else interval
+        self.next_frame: float = 0.0
+        self.next_tick: float = 0.0
+        self.last_frame_time: float = 0.0
+        self.frames: int = 0
+        self.skipped: int = 0
+
+    def frame_done(self, start: float, cost: float) -> None:
+        self.frames += 1
+        self.last_frame_time = cost
+        if cost > self.budget:
+            self.skipped += int(cost // self.interval) if self.interval else 0
+            self.next_frame = start + 2 * cost
+        else:
+            self.next_frame = start + self.interval
 
 
 class Screen:
-    def __init__(self):
+    def __init__(self, backend: Backend | None = None):
+        # Curses by default; pass a HeadlessBackend to run without a terminal.
+        self.backend = backend if backend is not None else CursesBackend()
         self.stdscr: object = None
         self.widgets: list[Widget] = []
-        self.modal: Widget | None = None
-        self.loading: bool = False
+        self._modal: Widget | None = None
+        self._loading: bool = False
         self.loading_message: str = "Loading..."
         self.should_exit: bool = False
         self.event_dispatcher = EventDispatcher()
+        self.focus_manager = FocusManager(self, lambda: self.widgets)
         self._last_render_time: float = time.monotonic()
         self.needs_render: bool = True
+        self._full_redraw: bool = True
+        self._dirty_widgets: set[Widget] = set()
+        self._damage: list[tuple[int, int, int, int]] = []
+        self._buffer = CellBuffer()
+        self._selector = selectors.DefaultSelector()
+        self._timers = TimerQueue()
+        self._pollers: dict[callable, list[Timer]] = {}
+        self._event_driven: bool = False
+        self._wakeup_fds: tuple[int, int] | None = None
+        self._input_fd: int | None = None
+        self._resized: bool = False
+        self.bracketed_paste: bool = True
+        self._paste: bytearray | None = None
+        self._key_backlog: list[int] = []
+        self.profiler: FrameProfiler | None = None
+        self.profiler_toggle_key: int = curses.KEY_F12
+        self._overlay_bounds: tuple[int, int, int, int] | None = None
+        self.spinner_interval: float = 0.1
+        self._spinner_index: int = 0
+        self._spinner_timer: Timer | None = None
+        self._pacer = _FramePacer(0.016)
+        # While a modal or the loading box is shown, the widgets are drawn into _background and only
+        # the damaged parts of it are copied to the frame, so overlays are composited over an
+        # unchanging snapshot instead of over a redrawn tree.
+        self._background: CellBuffer | None = None
+        self._overlay_rects: list[tuple[int, int, int, int]] = []
+        self._overlay_dirty: bool = False
+        self._loading_frame: Widget | None = None
+        self._loading_label: Widget | None = None
         self._spinner_frames = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
 
-    def _init_curses_environment(self) -> None:
-        os.environ.setdefault('ESCDELAY', '25')
-        self.stdscr = curses.initscr()
-        curses.noecho()
-        curses.cbreak()
-        self.stdscr.keypad(True)
-        self.stdscr.timeout(16)
-        curses.curs_set(0)
-        curses.start_color()
-        curses.use_default_colors()
-        curses.init_pair(1, curses.COLOR_WHITE, -1)
-        curses.init_pair(2, curses.COLOR_CYAN, -1)
-        curses.init_pair(3, curses.COLOR_YELLOW, -1)
-        curses.init_pair(4, curses.COLOR_RED, -1)
-
-    def _destroy_curses_environment(self) -> None:
-        if self.stdscr:
-            curses.curs_set(1)
-            self.stdscr.keypad(False)
-            curses.echo()
-            curses.nocbreak()
-            curses.endwin()
+    @property
+    def modal(self) -> Widget | None:
+        return self._modal
+
+    @modal.setter
+    def modal(self, widget: Widget | None) -> None:
+        if widget is self._modal:
+            return
+        if self._modal is not None and self._modal.parent is self:
+            self._modal.parent = None
+        self._modal = widget
+        if widget is not None:
+            widget.parent = self
+        self._overlay_dirty = True
+        self.needs_render = True
+
+    @property
+    def loading(self) -> bool:
+        return self._loading
+
+    @loading.setter
+    def loading(self, value: bool) -> None:
+        if value != self._loading:
+            self._loading = value
+            if value:
+                self._spinner_timer = self.set_interval(self.spinner_interval, self._advance_spinner)
+            elif self._spinner_timer is not None:
+                self._spinner_timer.cancel()
+                self._spinner_timer = None
+            self._overlay_dirty = True
+            self.needs_render = True
+
+    def _advance_spinner(self) -> None:
+        self._spinner_index += 1
+        self._overlay_dirty = True
+        self.needs_render = True
+
+    def start(self) -> None:
+        self.backend.start(self.bracketed_paste)
+        self.stdscr = self.backend.window
+        backends._set_active(self.backend)
+        # Pairs from an earlier session mean nothing to this terminal.
+        colors.registry.reset()
+        colors.registry.on_evict = self.refresh
+
+    def stop(self) -> None:
+        if self.stdscr is not None:
+            self.backend.stop()
+            self.stdscr = None
+            backends._set_active(None)
+
+    def enable_profiler(self, history: int = 600, overlay: bool = False) -> FrameProfiler:
+        # Starts recording frame, widget and handler timings; `profiler_toggle_key` (F12) shows or
+        # hides the overlay. Returns the profiler, whose export(path) writes JSON or CSV.
+        if self.profiler is None:
+            self.profiler = FrameProfiler(history)
+        self.profiler.overlay = overlay
+        profiling.active = self.profiler
+        self.refresh()
+        return self.profiler
+
+    def disable_profiler(self) -> None:
+        if profiling.active is self.profiler:
+            profiling.active = None
+        self.profiler = None
+        self.refresh()
+
+    def toggle_profiler_overlay(self) -> None:
+        if self.profiler is not None:
+            self.profiler.overlay = not self.profiler.overlay
+            self.refresh()
+
+    def _draw_profiler_overlay(self, buf: CellBuffer, max_y: int, max_x: int) -> None:
+        width = min(44, max_x)
+        lines = self.profiler.overlay_lines(width)[:max_y]
+        x = max_x - width
+        for y, line in enumerate(lines):
+            buf.addstr(y, x, line, color_pair(2) | curses.A_REVERSE)
+        self._overlay_bounds = (0, x, len(lines), width)
 
     def add_widget(self, widget: Widget) -> None:
         self.widgets.append(widget)
+        widget.parent = self
+        tree_changed()
+        self._invalidate_child(widget)
 
     def remove_widget(self, widget: Widget) -> None:
         if widget in self.widgets:
             self.widgets.remove(widget)
+            self._dirty_widgets.discard(widget)
+            if widget._bounds is not None:
+                self._damage.append(widget._bounds)
+            if widget in self.focus_manager.path:
+                self.focus_manager.focus(None)
+            widget.parent = None
+            tree_changed()
+            self.needs_render = True
 
-    def _handle_input(self) -> None:
+    def _invalidate_child(self, widget: Widget) -> None:
+        self._dirty_widgets.add(widget)
+        self.needs_render = True
+
+    def add_reader(self, fd: int, callback: callable, *args) -> None:
+        self.remove_reader(fd)
+        self._selector.register(fd, selectors.EVENT_READ, (callback, args))
+
+    def remove_reader(self, fd: int) -> None:
         try:
-            key = self.stdscr.getch()
-            if key != -1:
-                char = chr(key) if 32 <= key <= 126 else None
-                self.event_dispatcher.post(create_key_event(key, char))
-        except (curses.error, ValueError):
+            self._selector.unregister(fd)
+        except (KeyError, ValueError):
             pass
 
+    def call_later(self, delay: float, callback: callable, *args) -> Timer:
+        # Runs callback(*args) on the UI thread after `delay` seconds; the returned Timer can be
+        # cancelled. Timers due within `timer_slack` seconds of each other run together.
+        return self._timers.add(delay, callback, args)
+
+    def set_interval(self, interval: float, callback: callable, *args, delay: float | None = None) -> Timer:
+        # Runs callback(*args) every `interval` seconds, first after `delay` (default: one interval).
+        # Periods missed while the loop was busy are skipped, not replayed.
+        return self._timers.add(interval if delay is None else delay, callback, args, interval)
+
+    @property
+    def timer_slack(self) -> float:
+        return self._timers.slack
+
+    @timer_slack.setter
+    def timer_slack(self, seconds: float) -> None:
+        self._timers.slack = seconds
+
+    # For sources a selector cannot watch (regular files): callback() runs every `interval` seconds.
+    def add_poller(self, callback: callable, interval: float) -> None:
+        self._pollers.setdefault(callback, []).append(self.set_interval(interval, callback, delay=0))
+
+    def remove_poller(self, callback: callable) -> None:
+        for timer in self._pollers.pop(callback, ()):
+            timer.cancel()
+
+    def _init_event_loop(self) -> None:
+        self.backend.input_timeout(0)
+        self._input_fd = self.backend.fileno()
+        if self._input_fd is not None:
+            self._selector.register(self._input_fd, selectors.EVENT_READ, None)
+        r, w = os.pipe()
+        os.set_blocking(r, False)
+        os.set_blocking(w, False)
+        self._wakeup_fds = (r, w)
+        self._selector.register(r, selectors.EVENT_READ, (self._drain_wakeup, ()))
+        # A Python-level SIGWINCH handler plus the wakeup fd makes resizes interrupt select().
+        self._prev_wakeup_fd = signal.set_wakeup_fd(w)
+        events._set_wakeup_fd(w)
+        self._prev_sigwinch = signal.signal(signal.SIGWINCH, self._on_resize)
+
+    def _close_event_loop(self) -> None:
+        if self._wakeup_fds is None:
+            return
+        signal.signal(signal.SIGWINCH, self._prev_sigwinch)
+        signal.set_wakeup_fd(self._prev_wakeup_fd)
+        events._set_wakeup_fd(None)
+        if self._input_fd is not None:
+            self.remove_reader(self._input_fd)
+        for fd in self._wakeup_fds:
+            self.remove_reader(fd)
+            os.close(fd)
+        self._wakeup_fds = None
+
+    def _drain_wakeup(self) -> None:
+        try:
+            while os.read(self._wakeup_fds[0], 4096):
+                pass
+        except BlockingIOError:
+            pass
+        events._clear_wakeup()
+
+    def _on_resize(self, signum: int, frame: object) -> None:
+        self._resized = True
+
+    def _apply_resize(self) -> None:
+        self._resized = False
+        self.backend.update_size()
+        self.refresh()
+
+    @property
+    def frames_skipped(self) -> int:
+        return self._pacer.skipped
+
+    @property
+    def last_frame_time(self) -> float:
+        return self._pacer.last_frame_time
+
+    def _next_timeout(self, main_loop_interval: float) -> float | None:
+        if _global_event_queue or self._resized:
+            return 0
+        pacer = self._pacer
+        deadlines = []
+        if 'render_tick' in self.event_dispatcher.handlers:
+            deadlines.append(pacer.next_tick)
+        if self.needs_render:
+            deadlines.append(pacer.next_frame)
+        timer = self._timers.next_deadline()
+        if timer is not None:
+            deadlines.append(timer)
+        if self._key_backlog:
+            # Not readable again until more input comes, so wake to post a lone partial marker as keys.
+            deadlines.append(time.monotonic() + _MARKER_WAIT)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def _wait(self, timeout: float | None) -> None:
+        for key, _ in self._selector.select(timeout):
+            if key.data is not None:
+                callback, args = key.data
+                callback(*args)
+
+    def _handle_input(self) -> None:
+        new_keys = self.backend.read_keys()
+        if not new_keys and not self._key_backlog:
+            return
+        keys = self._key_backlog + new_keys
+        self._key_backlog = []
+        post = self.event_dispatcher.post
+        i, n = 0, len(keys)
+        while i < n:
+            key = keys[i]
+            if key == 27 and (new_keys or self._paste is not None):
+                marker = _PASTE_END if self._paste is not None else _PASTE_START
+                tail = keys[i:i + 6]
+                if tail == marker:
+                    if self._paste is None:
+                        self._paste = bytearray()
+                    else:
+                        post(create_paste_event(self._paste.decode('utf-8', 'replace')))
+                        self._paste = None
+                    i += 6
+                    continue
+                if len(tail) < 6 and tail == marker[:len(tail)] and (len(tail) > 1 or self._paste is not None):
+                    # A marker split across reads; finish it on a later read. Outside a paste a partial
+                    # start marker is posted as keys if nothing follows; inside one, even a lone ESC
+                    # waits, since the paste can only end with the full end marker.
+                    self._key_backlog = tail
+                    break
+            if self._paste is not None:
+                if key < 256:
+                    self._paste.append(key)
+            else:
+                char = chr(key) if 32 <= key <= 126 else None
+                post(create_key_event(key, char))
+            i += 1
+
     def _render(self) -> None:
-        self.stdscr.erase()
-        max_y, max_x = self.stdscr.getmaxyx()
-        for widget in self.widgets:
-            widget.render(self.stdscr, max_y, max_x)
-        
-        if self.loading:
-            import lokutui.widgets as widgets
-            lw, lh = 40, 5
-            lx, ly = (max_x - lw) // 2, (max_y - lh) // 2
-            for i in range(lh):
-                try: self.stdscr.addstr(ly + i, lx, " " * lw, curses.color_pair(1))
-                except curses.error: pass
-            
-            spinner = self._spinner_frames[int(time.time() * 10) % len(self._spinner_frames)]
-            widgets.Frame(f" {spinner} SYSTEM ", lx, ly, lw, lh, color_pair=2).render(self.stdscr, max_y, max_x)
-            widgets.Label(self.loading_message.center(lw - 4), lx + 2, ly + 2, width=lw - 4, color_pair=3).render(self.stdscr, max_y, max_x)
+        profiler = self.profiler
+        if profiler is not None:
+            start = time.perf_counter()
+        max_y, max_x = self.backend.size()
+        buf = self._buffer
+        dirty = self._dirty_widgets
+        modal = self._modal
+        overlaid = modal is not None or self._loading
+        if self._full_redraw or (max_y, max_x) != buf.getmaxyx():
+            if (max_y, max_x) != buf.getmaxyx():
+                buf.resize(max_y, max_x)
+            buf.erase()
+            self._full_redraw = False
+            evictions = colors.registry.evictions
+            for widget in self.widgets:
+                widget.parent = self
+                widget._paint(buf, max_y, max_x)
+            if colors.registry.evictions != evictions:
+                # This frame alone uses more styles than there are pairs; drawing it again would
+                # only evict again.
+                self._full_redraw = False
+            damage = [(0, 0, max_y, max_x)]
+            self._background = buf.copy() if overlaid else None
+            self._overlay_rects = []
+            self._overlay_dirty = overlaid
+        else:
+            damage = self._damage
+            if self._overlay_bounds is not None:
+                damage.append(self._overlay_bounds)
+                self._overlay_bounds = None
+            for widget in dirty:
+                if widget is not modal:
+                    widget._collect_damage(damage, max_y, max_x)
+            background = self._background
+            target = background if background is not None else buf
+            for rect in damage:
+                target.fill(*rect)
+            for widget in self.widgets:
+                if widget in dirty or _intersects(widget._bounds, damage):
+                    widget._repaint(target, max_y, max_x, damage)
+            if background is not None:
+                for rect in damage:
+                    buf.blit(background, *rect)
+                if not overlaid or self._overlay_dirty or modal in dirty or any(_intersects(rect, damage) for rect in self._overlay_rects):
+                    # Overlays may have changed, moved or closed; what they covered comes back from
+                    # the snapshot and whatever is still open is drawn again on top.
+                    for rect in self._overlay_rects:
+                        buf.blit(background, *rect)
+                    self._overlay_rects = []
+                    self._overlay_dirty = overlaid
+                if not overlaid:
+                    self._background = None
+            elif overlaid:
+                # Overlays are opening: the frame so far is exactly the background.
+                self._background = buf.copy()
+                self._overlay_dirty = True
 
-        if self.modal:
-            self.modal.render(self.stdscr, max_y, max_x)
-        self.stdscr.refresh()
+        if overlaid and self._overlay_dirty:
+            rects = []
+            if self._loading:
+                rects.append(self._draw_loading(buf, max_y, max_x))
+            if modal is not None:
+                modal._paint(buf, max_y, max_x)
+                if modal._bounds is not None:
+                    rects.append(modal._bounds)
+            self._overlay_rects = rects
+        self._overlay_dirty = False
+        if profiler is not None and profiler.overlay:
+            self._draw_profiler_overlay(buf, max_y, max_x)
+        buf.flush(self.stdscr)
+        self.backend.refresh()
+        self._damage = []
+        dirty.clear()
         self._last_render_time = time.monotonic()
+        if profiler is not None:
+            profiler.record_frame((time.perf_counter() - start) * 1e3)
+
+    def _draw_loading(self, buf: CellBuffer, max_y: int, max_x: int) -> tuple[int, int, int, int]:
+        # The box is built once and moved or retitled in place on later frames.
+        if self._loading_frame is None:
+            from lokutui.widgets import Frame, Label
+            self._loading_frame = Frame("", width=40, height=5, color_pair=2)
+            self._loading_label = Label("", width=36, color_pair=3)
+        lw, lh = 40, 5
+        lx, ly = (max_x - lw) // 2, (max_y - lh) // 2
+        buf.fill(ly, lx, lh, lw, attr=color_pair(1))
+        spinner = self._spinner_frames[self._spinner_index % len(self._spinner_frames)]
+        frame, label = self._loading_frame, self._loading_label
+        frame.x, frame.y, frame.title = lx, ly, f" {spinner} SYSTEM "
+        label.x, label.y, label.text = lx + 2, ly + 2, self.loading_message.center(lw - 4)
+        frame.render(buf, max_y, max_x)
+        label.render(buf, max_y, max_x)
+        return (ly, lx, lh, lw)
 
     def refresh(self) -> None:
+        self._full_redraw = True
         self.needs_render = True
 
-    def run(self, initial_setup_callback: callable | None = None, main_loop_interval: float = 0.016) -> None:
-        from lokutui.events import CustomEvent 
-        self._init_curses_environment()
+    def _process_events(self) -> None:
+        profiler = self.profiler
+        if profiler is not None:
+            start, depth = time.perf_counter(), len(_global_event_queue)
+        dispatcher = self.event_dispatcher
+        # Only events queued before the drain starts are handled this frame, so producers posting
+        # faster than handlers run cannot keep the loop from rendering.
+        for _ in range(len(_global_event_queue)):
+            event = _global_event_queue.popleft()
+            if event.type == 'key':
+                if event.data['code'] in [ord('q'), ord('Q')]:
+                    self.should_exit = True
+                    break
+                if event.data['code'] == curses.KEY_RESIZE:
+                    # curses has already adopted the new size; every widget must be laid out again.
+                    self.refresh()
+            
+            if profiler is not None and event.type == 'key' and event.data['code'] == self.profiler_toggle_key:
+                self.toggle_profiler_overlay()
+                continue
+
+            if dispatcher.defer(event):
+                continue
+            
+            if self.modal and self.modal.handle_event(event):
+                continue
+            
+            if event.type in ('key', 'paste') and self._route_focus(event):
+                continue
+            
+            if event.type == 'paste' and 'paste' not in dispatcher.handlers and 'paste' not in dispatcher.batch_handlers:
+                # An app written for keys alone still gets pasted text, typed as if bracketed paste were off.
+                self._dispatch_as_keys(event.data['text'])
+                continue
+
+            dispatcher.dispatch(event)
+        dispatcher.flush_pending()
+        if profiler is not None and depth:
+            profiler.record_events((time.perf_counter() - start) * 1e3, depth)
+
+    def _dispatch_as_keys(self, text: str) -> None:
+        dispatcher = self.event_dispatcher
+        for ch in text:
+            code = ord(ch)
+            event = create_key_event(code, ch if 32 <= code <= 126 else None)
+            if not dispatcher.defer(event):
+                dispatcher.dispatch(event)
+
+    def _route_focus(self, event) -> bool:
+        focus = self.focus_manager
+        if focus.focused is None or self.modal:
+            return False
+        if focus.route(event):
+            return True
+        if event.type == 'key' and event.data['code'] in (ord('\t'), curses.KEY_BTAB):
+            focus.focus_next() if event.data['code'] == ord('\t') else focus.focus_prev()
+            return True
+        return False
+
+    def run(self, initial_setup_callback: callable | None = None, main_loop_interval: float = 0.016, event_driven: bool = False, target_fps: float | None = None, frame_budget: float | None = None) -> None:
+        # target_fps overrides main_loop_interval. frame_budget (seconds, default one interval) is
+        # how long a frame may take before the next one is pushed back to keep input responsive.
+        if target_fps:
+            main_loop_interval = 1.0 / target_fps
+        self._pacer = pacer = _FramePacer(main_loop_interval, frame_budget)
+        self.start()
+        self._event_driven = event_driven
         try:
+            if event_driven:
+                self._init_event_loop()
+            else:
+                # Polling: each read waits up to one frame interval for input, so the loop idles.
+                self.backend.input_timeout(max(1, round(main_loop_interval * 1000)))
             if initial_setup_callback:
                 initial_setup_callback()
             
             while not self.should_exit:
+                if event_driven:
+                    self._wait(self._next_timeout(main_loop_interval))
+                    if self._resized:
+                        self._apply_resize()
+                elif len(self._selector.get_map()):
+                    self._wait(0)
+                self._timers.run_due()
+                # Input and events always run before a frame is considered.
                 self._handle_input()
-                
-                while _global_event_queue:
-                    event = _global_event_queue.popleft()
-                    if event.type == 'key':
-                        self.needs_render = True
-                        if event.data['code'] in [ord('q'), ord('Q')]:
-                            self.should_exit = True
-                            break
-                    
-                    if self.modal and self.modal.handle_event(event):
-                        self.needs_render = True
-                        continue
-                    
-                    self.event_dispatcher.dispatch(event)
+                self._process_events()
                 
                 now = time.monotonic()
-                if now - self._last_render_time >= main_loop_interval:
+                if now >= pacer.next_tick:
                     self.event_dispatcher.dispatch(CustomEvent('render_tick'))
-                    if self.needs_render or self.modal or self.loading:
-                        self._render()
-                        self.needs_render = False
-                    self._last_render_time = now
+                    pacer.next_tick += main_loop_interval
+                    if pacer.next_tick <= now:
+                        pacer.next_tick = now + main_loop_interval
+                if now >= pacer.next_frame and self.needs_render:
+                    # Cleared first: a color pair evicted while drawing asks for another full frame.
+                    self.needs_render = False
+                    self._render()
+                    pacer.frame_done(now, time.monotonic() - now)
         finally:
-            self._destroy_curses_environment()
+            self._close_event_loop()
+            self._event_driven = False
+            self.stop()
+
+    def _frame(self) -> None:
+        self.event_dispatcher.dispatch(CustomEvent('render_tick'))
+        if self.needs_render:
+            self.needs_render = False
+            self._render()
+
+    def step(self) -> None:
+        # One loop iteration with no waiting or frame pacing: read pending input, handle the queued
+        # events and draw a frame if anything changed. Drives a screen by hand, e.g. headless in
+        # tests; the backend is started on the first call and stopped by stop().
+        if self.stdscr is None:
+            self.start()
+        if len(self._selector.get_map()):
+            self._wait(0)
+        self._timers.run_due()
+        self._handle_input()
+        self._process_events()
+        self._frame()
+        self._last_render_time = time.monotonic()
 
     def exit(self) -> None:
         self.should_exit = True
 
 
 class Widget:
+    # Attributes whose assignment changes what the widget draws; setting one invalidates the widget.
+    _render_attrs: frozenset[str] = frozenset({'x', 'y', 'width', 'height', 'visible'})
+    focusable: bool = False
+
     def __init__(self, x: int = 0, y: int = 0, width: int | None = None, height: int | None = None):
+        self.parent: Widget | Screen | None = None
+        self._dirty: bool = True
+        self._child_dirty: bool = False
+        self._bounds: tuple[int, int, int, int] | None = None
         self.x = x
         self.y = y
         self.width = width
         self.height = height
         self.visible: bool = True
+
+    def __setattr__(self, name: str, value: object) -> None:
+        if name not in self._render_attrs:
+            object.__setattr__(self, name, value)
+            return
+        old = self.__dict__.get(name, _UNSET)
+        object.__setattr__(self, name, value)
+        if old is not value and (type(old) not in _SCALAR_TYPES or old != value):
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        self._dirty = True
+        if self.parent is not None:
+            self.parent._invalidate_child(self)
+
+    def _invalidate_child(self, widget: Widget) -> None:
+        self.invalidate()
+
+    def children(self) -> list[Widget]:
+        return []
+
+    def bounds(self, max_y: int, max_x: int) -> tuple[int, int, int, int]:
+        width = self.width if self.width is not None else max_x - self.x
+        height = self.height if self.height is not None else 1
+        return (self.y, self.x, height, width)
+
+    def _paint(self, stdscr: object, max_y: int, max_x: int) -> None:
+        if profiling.active is None:
+            self.render(stdscr, max_y, max_x)
+        else:
+            start = time.perf_counter()
+            self.render(stdscr, max_y, max_x)
+            profiling.active.record_widget(self, (time.perf_counter() - start) * 1e3)
+        self._bounds = self.bounds(max_y, max_x) if self.visible else None
+        self._dirty = self._child_dirty = False
+
+    def _collect_damage(self, damage: list[tuple[int, int, int, int]], max_y: int, max_x: int) -> None:
+        if self._bounds is not None:
+            damage.append(self._bounds)
+        if self.visible:
+            damage.append(self.bounds(max_y, max_x))
+
+    def _repaint(self, stdscr: object, max_y: int, max_x: int, damage: list[tuple[int, int, int, int]]) -> None:
+        # Repainted in full, so whatever is drawn above it in that area must be repainted too.
+        self._paint(stdscr, max_y, max_x)
+        if self._bounds is not None:
+            damage.append(self._bounds)
         
     def render(self, stdscr: object, max_y: int, max_x: int) -> None:
         if not self.visible:
@@ -137,3 +649,7 @@ class Widget:
 
     def handle_event(self, event: object) -> bool:
         return False
+
+    # Called for events the focused descendant did not consume; containers only route, so they decline.
+    def handle_bubbled_event(self, event: object) -> bool:
+        return False
@@ -1,11 +1,16 @@
 from __future__ import annotations
+import os
 from collections import namedtuple, deque
+from lokutui import profiler
 
 Event = namedtuple('Event', ['type', 'data'])
 
 def create_key_event(key_code: int, char: str | None = None) -> Event:
     return Event('key', {'code': key_code, 'char': char})
 
+def create_paste_event(text: str) -> Event:
+    return Event('paste', {'text': text})
+
 def MouseEvent(x: int, y: int, button: int, event_type: str) -> Event:
     return Event('mouse', {'x': x, 'y': y, 'button': button, 'event_type': event_type})
 
@@ -19,6 +24,10 @@ class EventDispatcher:
         if cls._instance is None:
             cls._instance = super(EventDispatcher, cls).__new__(cls)
             cls._instance.handlers: dict[str, list[callable]] = {}
+            cls._instance.batch_handlers: dict[str, list[callable]] = {}
+            cls._instance._coalescing: dict[str, tuple[str | callable | None, callable | None]] = {}
+            cls._instance._coalesced: dict[tuple, Event] = {}
+            cls._instance._batches: dict[str, list[Event]] = {}
         return cls._instance
 
     def register_handler(self, event_type: str, handler_func: callable) -> None:
@@ -26,12 +35,83 @@ class EventDispatcher:
             self.handlers[event_type] = []
         self.handlers[event_type].append(handler_func)
 
+    def register_batch_handler(self, event_type: str, handler_func: callable) -> None:
+        # Batch handlers receive a list with every event of the type dispatched since the last flush_pending().
+        if event_type not in self.batch_handlers:
+            self.batch_handlers[event_type] = []
+        self.batch_handlers[event_type].append(handler_func)
+
+    def set_coalescing(self, event_type: str, key: str | callable | None = None, merge: callable | None = None) -> None:
+        # Queued events of this type are folded per key (the type itself, event.data[key], or key(event))
+        # and delivered once per flush_pending(): the latest one, or merge(previous, new) if given.
+        self._coalescing[event_type] = (key, merge)
+
+    def clear_coalescing(self, event_type: str) -> None:
+        self._coalescing.pop(event_type, None)
+
     def dispatch(self, event: Event) -> None:
         if event.type in self.handlers:
-            for handler in self.handlers[event.type]:
-                handler(event)
+            if profiler.active is not None:
+                profiler.active.call_handlers(self.handlers[event.type], event)
+            else:
+                for handler in self.handlers[event.type]:
+                    handler(event)
+        if event.type in self.batch_handlers:
+            self._batches.setdefault(event.type, []).append(event)
+
+    def defer(self, event: Event) -> bool:
+        if event.type not in self._coalescing:
+            return False
+        key, merge = self._coalescing[event.type]
+        if key is None:
+            slot = (event.type,)
+        elif callable(key):
+            slot = (event.type, key(event))
+        else:
+            slot = (event.type, event.data.get(key))
+        previous = self._coalesced.get(slot)
+        self._coalesced[slot] = merge(previous, event) if merge and previous is not None else event
+        return True
+
+    def flush_pending(self) -> None:
+        coalesced, self._coalesced = self._coalesced, {}
+        for event in coalesced.values():
+            self.dispatch(event)
+        batches, self._batches = self._batches, {}
+        for event_type, batch in batches.items():
+            if profiler.active is not None:
+                profiler.active.call_handlers(self.batch_handlers.get(event_type, ()), batch)
+                continue
+            for handler in self.batch_handlers.get(event_type, ()):
+                handler(batch)
 
     def post(self, event: Event) -> None:
         _global_event_queue.append(event)
 
+    def post_threadsafe(self, event: Event) -> None:
+        # Safe to call from any thread: deque.append is atomic, and the running event-driven loop
+        # is woken at most once per drain instead of once per event, so bursts take no lock.
+        global _wakeup_pending
+        _global_event_queue.append(event)
+        if _wakeup_fd is not None and not _wakeup_pending:
+            _wakeup_pending = True
+            try:
+                os.write(_wakeup_fd, b'\0')
+            except (BlockingIOError, OSError):
+                pass
+
 _global_event_queue: deque[Event] = deque()
+_wakeup_fd: int | None = None
+_wakeup_pending: bool = False
+
+def _set_wakeup_fd(fd: int | None) -> None:
+    global _wakeup_fd, _wakeup_pending
+    _wakeup_fd = fd
+    _wakeup_pending = False
+
+def _clear_wakeup() -> None:
+    # Cleared after the wakeup pipe is emptied, never before: a post in between finds the flag
+    # still set and skips its write, but its event is already queued for the drain that follows,
+    # and the next post writes again.
+    global _wakeup_pending
+    _wakeup_pending = False
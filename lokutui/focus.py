@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+# Bumped whenever widgets are added to or removed from a tree; focus managers rebuild their
+# cached tab order and focus path lazily when it changes.
+_tree_generation: int = 0
+
+
+def tree_changed() -> None:
+    global _tree_generation
+    _tree_generation += 1
+
+
+class FocusManager:
+    def __init__(self, owner: object, roots: callable):
+        self.owner = owner
+        self._roots = roots
+        self.focused: object | None = None
+        self._order: list = []
+        self._path: list = []
+        self._generation: int = -1
+
+    def _refresh(self) -> None:
+        if self._generation == _tree_generation:
+            return
+        order: list = []
+        stack = list(reversed(self._roots()))
+        while stack:
+            widget = stack.pop()
+            if widget.focusable:
+                order.append(widget)
+            stack.extend(reversed(widget.children()))
+        self._order = order
+        self._path = self._build_path(self.focused)
+        self._generation = _tree_generation
+
+    def _build_path(self, widget: object | None) -> list:
+        path = []
+        while widget is not None and widget is not self.owner:
+            path.append(widget)
+            widget = widget.parent
+        return path
+
+    @property
+    def tab_order(self) -> list:
+        self._refresh()
+        return self._order
+
+    @property
+    def path(self) -> list:
+        self._refresh()
+        return self._path
+
+    def focus(self, widget: object | None) -> None:
+        if widget is self.focused:
+            return
+        if self.focused is not None:
+            self.focused.focused = False
+        self.focused = widget
+        if widget is not None:
+            widget.focused = True
+        self._path = self._build_path(widget)
+
+    def _step(self, direction: int) -> None:
+        order = self.tab_order
+        if not order:
+            return
+        try:
+            start = order.index(self.focused)
+        except ValueError:
+            start = -1 if direction > 0 else 0
+        for i in range(1, len(order) + 1):
+            candidate = order[(start + direction * i) % len(order)]
+            if candidate.visible:
+                self.focus(candidate)
+                return
+
+    def focus_next(self) -> None:
+        self._step(1)
+
+    def focus_prev(self) -> None:
+        self._step(-1)
+
+    def route(self, event: object) -> bool:
+        # The focused widget gets the event first, then each ancestor up to the owner: O(depth).
+        path = self.path
+        if not path:
+            return False
+        if path[0].handle_event(event):
+            return True
+        for ancestor in path[1:]:
+            if ancestor.handle_bubbled_event(event):
+                return True
+        return False
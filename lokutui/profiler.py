@@ -0,0 +1,155 @@
+from __future__ import annotations
+import csv
+import json
+import time
+from collections import deque
+
+# The profiler of the running Screen, or None. Instrumented code checks this once per widget paint
+# and per dispatch, so leaving profiling off costs a global lookup.
+active: FrameProfiler | None = None
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class _Timings:
+    # Count, total and max of every sample, plus the most recent ones for percentiles.
+    def __init__(self, history: int):
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+        self.recent: deque[float] = deque(maxlen=history)
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+        self.recent.append(ms)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.recent)
+        return {
+            'count': self.count,
+            'total_ms': self.total,
+            'mean_ms': self.total / self.count if self.count else 0.0,
+            'p50_ms': _percentile(ordered, 0.5),
+            'p95_ms': _percentile(ordered, 0.95),
+            'p99_ms': _percentile(ordered, 0.99),
+            'max_ms': self.max,
+        }
+
+
+def _widget_name(widget: object) -> str:
+    return f"{type(widget).__name__}@{getattr(widget, 'y', '?')},{getattr(widget, 'x', '?')}"
+
+
+def _handler_name(handler: object) -> str:
+    return getattr(handler, '__qualname__', None) or repr(handler)
+
+
+# Frame, widget and handler timings for a Screen; see Screen.enable_profiler. Widget render times
+# include the widget's children. Frames are recorded when something is drawn, together with the
+# time spent on input and events since the previous frame and the deepest event queue seen.
+class FrameProfiler:
+    def __init__(self, history: int = 600):
+        self.history = history
+        self.overlay: bool = False
+        self.frames: deque[tuple[float, float, float, int]] = deque(maxlen=history)
+        self.widgets: dict[object, _Timings] = {}
+        self.handlers: dict[object, _Timings] = {}
+        self._events_ms: float = 0.0
+        self._queue_depth: int = 0
+
+    def reset(self) -> None:
+        self.frames.clear()
+        self.widgets.clear()
+        self.handlers.clear()
+        self._events_ms = 0.0
+        self._queue_depth = 0
+
+    def record_widget(self, widget: object, ms: float) -> None:
+        timings = self.widgets.get(widget)
+        if timings is None:
+            timings = self.widgets[widget] = _Timings(self.history)
+        timings.add(ms)
+
+    def record_handler(self, handler: object, ms: float) -> None:
+        timings = self.handlers.get(handler)
+        if timings is None:
+            timings = self.handlers[handler] = _Timings(self.history)
+        timings.add(ms)
+
+    def call_handlers(self, handlers: list, argument: object) -> None:
+        clock = time.perf_counter
+        for handler in handlers:
+            start = clock()
+            handler(argument)
+            self.record_handler(handler, (clock() - start) * 1e3)
+
+    def record_events(self, ms: float, queue_depth: int) -> None:
+        self._events_ms += ms
+        if queue_depth > self._queue_depth:
+            self._queue_depth = queue_depth
+
+    def record_frame(self, render_ms: float) -> None:
+        self.frames.append((time.monotonic(), render_ms, self._events_ms, self._queue_depth))
+        self._events_ms = 0.0
+        self._queue_depth = 0
+
+    @property
+    def fps(self) -> float:
+        # Frames drawn during the last second.
+        if not self.frames:
+            return 0.0
+        cutoff = time.monotonic() - 1.0
+        return float(sum(1 for frame in self.frames if frame[0] >= cutoff))
+
+    def summary(self) -> dict:
+        render = sorted(frame[1] for frame in self.frames)
+        events = sorted(frame[2] for frame in self.frames)
+        depths = [frame[3] for frame in self.frames]
+        return {
+            'frames': len(self.frames),
+            'fps': self.fps,
+            'render_ms': {'p50': _percentile(render, 0.5), 'p90': _percentile(render, 0.9), 'p99': _percentile(render, 0.99), 'max': render[-1] if render else 0.0},
+            'events_ms': {'p50': _percentile(events, 0.5), 'p90': _percentile(events, 0.9), 'p99': _percentile(events, 0.99), 'max': events[-1] if events else 0.0},
+            'queue_depth': {'max': max(depths, default=0), 'mean': sum(depths) / len(depths) if depths else 0.0},
+            'widgets': {_widget_name(w): t.summary() for w, t in self._slowest(self.widgets)},
+            'handlers': {_handler_name(h): t.summary() for h, t in self._slowest(self.handlers)},
+        }
+
+    @staticmethod
+    def _slowest(timings: dict, limit: int | None = None) -> list:
+        ranked = sorted(timings.items(), key=lambda item: item[1].total, reverse=True)
+        return ranked[:limit] if limit is not None else ranked
+
+    def export(self, path: str) -> None:
+        # JSON (summary plus every recorded frame) or, for a .csv path, one row per widget and handler.
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['kind', 'name', 'count', 'total_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'])
+                for kind, timings, name in (('widget', self.widgets, _widget_name), ('handler', self.handlers, _handler_name)):
+                    for key, t in self._slowest(timings):
+                        s = t.summary()
+                        writer.writerow([kind, name(key), s['count'], s['total_ms'], s['mean_ms'], s['p50_ms'], s['p95_ms'], s['p99_ms'], s['max_ms']])
+            return
+        report = self.summary()
+        report['frame_log'] = [{'time': t, 'render_ms': r, 'events_ms': e, 'queue_depth': q} for t, r, e, q in self.frames]
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    def overlay_lines(self, width: int) -> list[str]:
+        render = sorted(frame[1] for frame in self.frames)
+        last_depth = self.frames[-1][3] if self.frames else 0
+        lines = [
+            f"{self.fps:5.0f} fps  queue {last_depth}",
+            f"frame p50 {_percentile(render, 0.5):6.2f} p99 {_percentile(render, 0.99):6.2f} ms",
+        ]
+        for widget, timings in self._slowest(self.widgets, 3):
+            lines.append(f"{_widget_name(widget)[:width - 12]:<{width - 12}} {timings.total / timings.count:7.2f}ms")
+        return [line[:width].ljust(width) for line in lines]
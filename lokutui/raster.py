@@ -0,0 +1,89 @@
+from __future__ import annotations
+from array import array
+from collections.abc import Sequence
+
+from lokutui.series import ChartSeries
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Reduces a series to one (low, high) pair of dot rows per dot column, 0 being the bottom row and
+# -1 marking an empty column. With more samples than columns each column covers a bucket and keeps
+# its min and max, so a spike in any sample stays visible; with fewer, columns repeat the nearest
+# earlier sample. Uses NumPy when it is installed and C-level min()/max() over array slices if not;
+# a ChartSeries then supplies its bucket extents itself from per-block min/max.
+def column_extents(values: Sequence[float] | ChartSeries, columns: int, min_v: float, max_v: float, rows: int) -> tuple[list[int], list[int]]:
+    n = len(values)
+    if n == 0 or columns < 1 or rows < 1:
+        return [-1] * max(columns, 0), [-1] * max(columns, 0)
+    if isinstance(values, ChartSeries):
+        if np is None and n > columns:
+            lows, highs = values.bucket_extents(columns)
+            return _rows(lows, highs, min_v, max_v, rows)
+        values = values.values()
+    if np is not None:
+        return _extents_numpy(values, n, columns, min_v, max_v, rows)
+    return _extents_array(values, n, columns, min_v, max_v, rows)
+
+
+def _extents_numpy(values: Sequence[float], n: int, columns: int, min_v: float, max_v: float, rows: int) -> tuple[list[int], list[int]]:
+    if isinstance(values, array):
+        data = np.frombuffer(values, dtype=np.float64)
+    else:
+        data = np.asarray(values, dtype=np.float64)
+    if n > columns:
+        starts = np.arange(columns) * n // columns
+        low = np.fmin.reduceat(data, starts)
+        high = np.fmax.reduceat(data, starts)
+    else:
+        picks = np.arange(columns) * (n - 1) // max(columns - 1, 1) if n > 1 else np.zeros(columns, dtype=np.intp)
+        low = high = data[picks]
+    scale = (rows - 1) / (max_v - min_v)
+    low_rows = np.floor((low - min_v) * scale)
+    high_rows = np.floor((high - min_v) * scale)
+    empty = np.isnan(low) | np.isnan(high) | (high_rows < 0) | (low_rows > rows - 1)
+    low_rows = np.where(empty, -1, np.clip(low_rows, 0, rows - 1)).astype(np.intp)
+    high_rows = np.where(empty, -1, np.clip(high_rows, 0, rows - 1)).astype(np.intp)
+    return low_rows.tolist(), high_rows.tolist()
+
+
+def _extents_array(values: Sequence[float], n: int, columns: int, min_v: float, max_v: float, rows: int) -> tuple[list[int], list[int]]:
+    if n > columns:
+        lows, highs = [], []
+        start = 0
+        for c in range(1, columns + 1):
+            end = c * n // columns
+            chunk = values[start:end]
+            low, high = min(chunk), max(chunk)
+            if low != low or high != high:
+                # NaN poisons min/max ordering; drop the gaps and retry.
+                chunk = [v for v in chunk if v == v]
+                low, high = (min(chunk), max(chunk)) if chunk else (low, high)
+            lows.append(low)
+            highs.append(high)
+            start = end
+    else:
+        lows = highs = [values[c * (n - 1) // max(columns - 1, 1)] for c in range(columns)]
+    return _rows(lows, highs, min_v, max_v, rows)
+
+
+def _rows(lows: list[float], highs: list[float], min_v: float, max_v: float, rows: int) -> tuple[list[int], list[int]]:
+    scale = (rows - 1) / (max_v - min_v)
+    top = rows - 1
+    low_rows, high_rows = [], []
+    for low, high in zip(lows, highs):
+        if low != low or high != high:
+            low_rows.append(-1)
+            high_rows.append(-1)
+            continue
+        lo, hi = int((low - min_v) * scale // 1), int((high - min_v) * scale // 1)
+        if hi < 0 or lo > top:
+            low_rows.append(-1)
+            high_rows.append(-1)
+        else:
+            low_rows.append(max(lo, 0))
+            high_rows.append(min(hi, top))
+    return low_rows, high_rows
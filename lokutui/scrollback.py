@@ -0,0 +1,100 @@
+from __future__ import annotations
+import mmap
+import re
+import tempfile
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+
+# Append-only line store on disk. Lines are written UTF-8 encoded, one start offset per line is
+# kept in an array, and reads go through an mmap of the file, so fetching any line is O(1)
+# regardless of how much history there is.
+class DiskScrollback:
+    def __init__(self, path: str | None = None):
+        self._file = open(path, 'w+b') if path else tempfile.TemporaryFile()
+        self._offsets = array('Q', [0])
+        self._map: mmap.mmap | None = None
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def append(self, lines: list[str]) -> None:
+        if not lines:
+            return
+        encoded = [line.encode('utf-8', 'replace') for line in lines]
+        self._file.seek(0, 2)
+        self._file.write(b'\n'.join(encoded) + b'\n')
+        ends = accumulate((len(line) + 1 for line in encoded), initial=self._offsets[-1])
+        next(ends)
+        self._offsets.extend(ends)
+
+    def _view(self, end: int) -> mmap.mmap:
+        if self._map is None or len(self._map) < end:
+            self._file.flush()
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def lines(self, start: int, stop: int) -> list[str]:
+        start, stop = max(0, start), min(len(self), stop)
+        if start >= stop:
+            return []
+        offsets = self._offsets
+        view = self._view(offsets[stop])
+        return [view[offsets[i]:offsets[i + 1] - 1].decode('utf-8', 'replace') for i in range(start, stop)]
+
+    def find_lines(self, pattern: re.Pattern, start: int = 0, stop: int | None = None) -> list[int]:
+        # Indices of lines in [start, stop) matching pattern. A bytes pattern is searched over the
+        # mapped file at C speed, so it must not be able to match across a newline (a literal);
+        # a str pattern is tested line by line on the decoded text, with the same semantics as
+        # for lines still in memory (anchors, \s, Unicode case folding).
+        stop = len(self) if stop is None else min(len(self), stop)
+        if start >= stop:
+            return []
+        if isinstance(pattern.pattern, str):
+            return self._search_lines(pattern, range(start, stop))
+        offsets = self._offsets
+        view = self._view(offsets[stop])
+        end = offsets[stop]
+        found = []
+        match = pattern.search(view, offsets[start], end)
+        while match is not None:
+            line = bisect_right(offsets, match.start()) - 1
+            found.append(line)
+            if line + 1 >= stop:
+                break
+            match = pattern.search(view, offsets[line + 1], end)
+        return found
+
+    def filter_lines(self, pattern: re.Pattern, indices: object) -> list[int]:
+        # The subset of `indices` (ascending line indices) whose line matches pattern; see find_lines.
+        indices = [i for i in indices if i < len(self)]
+        if not indices:
+            return []
+        if isinstance(pattern.pattern, str):
+            return self._search_lines(pattern, indices)
+        offsets = self._offsets
+        view = self._view(offsets[indices[-1] + 1])
+        search = pattern.search
+        return [i for i in indices if search(view, offsets[i], offsets[i + 1] - 1)]
+
+    def _search_lines(self, pattern: re.Pattern[str], indices: object) -> list[int]:
+        offsets = self._offsets
+        view = self._view(offsets[len(self)])
+        search = pattern.search
+        return [i for i in indices if search(view[offsets[i]:offsets[i + 1] - 1].decode('utf-8', 'replace'))]
+
+    def __getitem__(self, idx: int) -> str:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        return self.lines(idx, idx + 1)[0]
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
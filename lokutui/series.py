@@ -0,0 +1,147 @@
+from __future__ import annotations
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+# Samples per block of the per-block extents ChartSeries keeps for decimation without NumPy.
+_BLOCK = 64
+_INF = float('inf')
+
+
+# Fixed-capacity series of floats for Chart. Appends overwrite the oldest sample once the ring is
+# full and cost O(1); min/max over the retained window are kept in monotonic deques, so they never
+# rescan the data. `version` changes on every mutation, letting the chart skip unchanged series.
+class ChartSeries:
+    def __init__(self, capacity: int = 10000, values: Iterable[float] | None = None):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.capacity = capacity
+        self.version: int = 0
+        self._data = array('d', bytes(8 * capacity))
+        self._count: int = 0
+        # (sample number, value); values increase along _mins and decrease along _maxes.
+        self._mins: deque[tuple[int, float]] = deque()
+        self._maxes: deque[tuple[int, float]] = deque()
+        # Min/max of each _BLOCK samples, by absolute block number modulo the ring: enough blocks
+        # that every one overlapping the retained window is intact. Empty or all-NaN is (inf, -inf).
+        self._block_count = capacity // _BLOCK + 2
+        self._block_lows = array('d', [_INF]) * self._block_count
+        self._block_highs = array('d', [-_INF]) * self._block_count
+        if values is not None:
+            self.extend(values)
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def append(self, value: float) -> None:
+        value = float(value)
+        n = self._count
+        self._data[n % self.capacity] = value
+        self._count = n + 1
+        self.version += 1
+        block = n // _BLOCK % self._block_count
+        if not n % _BLOCK:
+            self._block_lows[block], self._block_highs[block] = _INF, -_INF
+        oldest = n + 1 - self.capacity
+        mins, maxes = self._mins, self._maxes
+        if mins and mins[0][0] < oldest:
+            mins.popleft()
+        if maxes and maxes[0][0] < oldest:
+            maxes.popleft()
+        if value != value:
+            # NaN marks a gap; it takes no part in the range.
+            return
+        if value < self._block_lows[block]:
+            self._block_lows[block] = value
+        if value > self._block_highs[block]:
+            self._block_highs[block] = value
+        while mins and mins[-1][1] >= value:
+            mins.pop()
+        mins.append((n, value))
+        while maxes and maxes[-1][1] <= value:
+            maxes.pop()
+        maxes.append((n, value))
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.append(value)
+
+    def clear(self) -> None:
+        self._count = 0
+        self._mins.clear()
+        self._maxes.clear()
+        self.version += 1
+
+    @property
+    def min(self) -> float | None:
+        return self._mins[0][1] if self._mins else None
+
+    @property
+    def max(self) -> float | None:
+        return self._maxes[0][1] if self._maxes else None
+
+    def values(self) -> array:
+        # The retained samples, oldest first, as a new array('d').
+        if self._count <= self.capacity:
+            return self._data[:self._count]
+        split = self._count % self.capacity
+        return self._data[split:] + self._data[:split]
+
+    def bucket_extents(self, buckets: int) -> tuple[list[float], list[float]]:
+        # Min and max of each of `buckets` equal spans of the retained samples (NaN for a span with
+        # no values), bucketed like raster.column_extents. Whole blocks inside a span are read from
+        # the block extents, so a frame costs O(len / _BLOCK) rather than a pass over every sample.
+        size = len(self)
+        first = self._count - size
+        nan = float('nan')
+        lows, highs = [], []
+        start = first
+        for b in range(1, buckets + 1):
+            end = first + b * size // buckets
+            head, tail = -(-start // _BLOCK), end // _BLOCK
+            if tail - head < 2:
+                parts = [self._ring(self._data, self.capacity, start, end)]
+                blocks = None
+            else:
+                parts = [self._ring(self._data, self.capacity, start, head * _BLOCK),
+                         self._ring(self._data, self.capacity, tail * _BLOCK, end)]
+                blocks = (self._ring(self._block_lows, self._block_count, head, tail),
+                          self._ring(self._block_highs, self._block_count, head, tail))
+            low, high = _INF, -_INF
+            for chunk in parts:
+                if not chunk:
+                    continue
+                lo, hi = min(chunk), max(chunk)
+                if lo != lo or hi != hi:
+                    # NaN poisons min/max ordering; drop the gaps.
+                    chunk = [v for v in chunk if v == v]
+                    if not chunk:
+                        continue
+                    lo, hi = min(chunk), max(chunk)
+                low, high = min(low, lo), max(high, hi)
+            if blocks is not None:
+                low, high = min(low, min(blocks[0])), max(high, max(blocks[1]))
+            if low > high:
+                low = high = nan
+            lows.append(low)
+            highs.append(high)
+            start = end
+        return lows, highs
+
+    @staticmethod
+    def _ring(data: array, size: int, start: int, stop: int) -> array:
+        # Entries start..stop-1 by absolute position in a ring of `size`.
+        i = start % size
+        j = i + stop - start
+        return data[i:j] if j <= size else data[i:] + data[:j - size]
+
+    def __getitem__(self, index: int) -> float:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('series index out of range')
+        return self._data[(self._count - size + index) % self.capacity]
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values())
@@ -0,0 +1,110 @@
+from __future__ import annotations
+import os
+import stat
+
+
+# Feeds a LogDisplay from a file descriptor without blocking the UI. Pipes, sockets and ttys are
+# registered with Screen.add_reader; regular files (which a selector cannot watch) are polled.
+# Each wakeup reads at most max_bytes_per_frame bytes; anything left is read on the next one.
+class LogStream:
+    def __init__(self, log: object, fd: int, max_bytes_per_frame: int = 256 * 1024, chunk_size: int = 64 * 1024, encoding: str = 'utf-8', follow: bool = False, poll_interval: float = 0.25, close_fd: bool = True, on_eof: callable | None = None):
+        self.log = log
+        self.fd = fd
+        self.max_bytes_per_frame = max_bytes_per_frame
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.follow = follow
+        self.poll_interval = poll_interval
+        self.close_fd = close_fd
+        self.on_eof = on_eof
+        # A file object that owns fd (a Popen pipe); closed instead of the bare descriptor.
+        self._owner: object | None = None
+        self.bytes_read: int = 0
+        self.closed: bool = False
+        self._partial = b''
+        self._screen: object | None = None
+        self._regular = stat.S_ISREG(os.fstat(fd).st_mode)
+        self._position = os.lseek(fd, 0, os.SEEK_CUR) if self._regular else 0
+        if not self._regular:
+            os.set_blocking(fd, False)
+
+    @classmethod
+    def for_process(cls, log: object, process: object, **kwargs) -> list[LogStream]:
+        # process is a subprocess.Popen started with stdout and/or stderr=PIPE. The pipes own their
+        # descriptors, so closing a stream closes its pipe object rather than the fd behind its back.
+        streams = []
+        for pipe in (process.stdout, process.stderr):
+            if pipe is not None:
+                stream = cls(log, pipe.fileno(), **{**kwargs, 'close_fd': False})
+                stream._owner = pipe
+                streams.append(stream)
+        return streams
+
+    @classmethod
+    def tail(cls, log: object, path: str, from_start: bool = False, **kwargs) -> LogStream:
+        fd = os.open(path, os.O_RDONLY)
+        if not from_start:
+            os.lseek(fd, 0, os.SEEK_END)
+        kwargs.setdefault('follow', True)
+        return cls(log, fd, **kwargs)
+
+    def attach(self, screen: object) -> LogStream:
+        self._screen = screen
+        if self._regular:
+            screen.add_poller(self.read, self.poll_interval)
+        else:
+            screen.add_reader(self.fd, self.read)
+        return self
+
+    def detach(self) -> None:
+        if self._screen is not None:
+            if self._regular:
+                self._screen.remove_poller(self.read)
+            else:
+                self._screen.remove_reader(self.fd)
+            self._screen = None
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.detach()
+        self.closed = True
+        if self._owner is not None:
+            self._owner.close()
+        elif self.close_fd:
+            os.close(self.fd)
+
+    def read(self) -> None:
+        if self.closed:
+            return
+        if self._regular and self.follow and os.fstat(self.fd).st_size < self._position:
+            # Truncated or rotated in place: start over from the beginning.
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            self._position = 0
+        chunks = []
+        budget = self.max_bytes_per_frame
+        eof = False
+        while budget > 0:
+            try:
+                chunk = os.read(self.fd, min(self.chunk_size, budget))
+            except BlockingIOError:
+                break
+            if not chunk:
+                eof = True
+                break
+            chunks.append(chunk)
+            budget -= len(chunk)
+        if chunks:
+            data = self._partial + b''.join(chunks)
+            self.bytes_read += len(data) - len(self._partial)
+            self._position += len(data) - len(self._partial)
+            complete, newline, self._partial = data.rpartition(b'\n')
+            if newline:
+                self.log.add_messages(complete.decode(self.encoding, 'replace').split('\n'))
+        if eof and not (self._regular and self.follow):
+            if self._partial:
+                self.log.add_message(self._partial.decode(self.encoding, 'replace'))
+                self._partial = b''
+            self.close()
+            if self.on_eof:
+                self.on_eof(self)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+import heapq
+import time
+from itertools import count
+
+
+class Timer:
+    __slots__ = ('deadline', 'interval', 'callback', 'args', 'cancelled', '_queue')
+
+    def __init__(self, deadline: float, interval: float | None, callback: callable, args: tuple, queue: TimerQueue):
+        self.deadline = deadline
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        self.cancelled: bool = False
+        self._queue: TimerQueue | None = queue
+
+    @property
+    def active(self) -> bool:
+        return not self.cancelled and self._queue is not None
+
+    def cancel(self) -> None:
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self._queue is not None:
+            self._queue._cancelled += 1
+            self._queue = None
+
+
+# One-shot and repeating timers on a heap ordered by deadline (time.monotonic). Timers due within
+# `slack` seconds of each other fire in the same pass, so the loop wakes once for a group of nearly
+# simultaneous timers. Cancelled timers are dropped lazily, or in bulk once they are the majority.
+class TimerQueue:
+    def __init__(self, slack: float = 0.002):
+        self.slack = slack
+        self._heap: list[tuple[float, int, Timer]] = []
+        self._order = count()
+        self._cancelled: int = 0
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._cancelled
+
+    def add(self, delay: float, callback: callable, args: tuple = (), interval: float | None = None) -> Timer:
+        if interval is not None and interval <= 0:
+            raise ValueError('interval must be positive')
+        timer = Timer(time.monotonic() + max(0.0, delay), interval, callback, args, self)
+        heapq.heappush(self._heap, (timer.deadline, next(self._order), timer))
+        return timer
+
+    def _prune(self) -> None:
+        heap = self._heap
+        if self._cancelled > 64 and self._cancelled * 2 > len(heap):
+            self._heap = [entry for entry in heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+            return
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+
+    def next_deadline(self) -> float | None:
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now: float | None = None) -> int:
+        # Fires every timer due by now (plus slack); returns how many ran.
+        if now is None:
+            now = time.monotonic()
+        self._prune()
+        heap = self._heap
+        limit = now + self.slack
+        due = []
+        while heap and heap[0][0] <= limit:
+            timer = heapq.heappop(heap)[2]
+            if timer.cancelled:
+                self._cancelled -= 1
+            else:
+                # Off the heap now; cancelling it from an earlier callback only sets the flag.
+                timer._queue = None
+                due.append(timer)
+        for timer in due:
+            if timer.cancelled:
+                continue
+            if timer.interval is not None:
+                # Rescheduled before the callback runs so it can cancel itself; missed periods are
+                # skipped rather than replayed in a burst.
+                timer.deadline += timer.interval
+                if timer.deadline <= now:
+                    timer.deadline = now + timer.interval
+                timer._queue = self
+                heapq.heappush(heap, (timer.deadline, next(self._order), timer))
+            timer.callback(*timer.args)
+        return len(due)
@@ -1 +1 @@
-from ._widgets import Label, Box, Button, TextInput, LogDisplay, ProgressBar, Chart, List, Select, Checkbox, VStack, HStack, Frame, Dialog, FormDialog
+from ._widgets import Label, Box, Button, TextInput, LogDisplay, ProgressBar, Chart, List, ListDataSource, Select, Checkbox, VStack, HStack, Frame, Dialog, FormDialog
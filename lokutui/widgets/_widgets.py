@@ -1,10 +1,24 @@
 from __future__ import annotations
-from lokutui.core import Widget
-from collections import deque
+from lokutui.core import Widget, _intersects, _UNSET, _SCALAR_TYPES
+from lokutui.buffer import Pad
+from lokutui.backend import curs_set
+from lokutui.colors import registry, resolve
+from lokutui.focus import FocusManager, tree_changed
+from lokutui.scrollback import DiskScrollback
+from lokutui.ansi import parse_ansi, style_attr
+from lokutui.series import ChartSeries
+from lokutui.raster import column_extents
+from collections import deque, OrderedDict
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, islice
+from collections.abc import Iterable
 import curses
 import re
 
 class Label(Widget):
+    _render_attrs = Widget._render_attrs | {'text', 'color_pair'}
+
     def __init__(self, text: str, x: int = 0, y: int = 0, color_pair: int = 1, width: int | None = None, height: int = 1):
         super().__init__(x, y, width, height)
         self.text = text
@@ -24,10 +38,16 @@ class Label(Widget):
         if len(display_text) > max_x - render_x: 
             display_text = display_text[:max_x - render_x]
         try:
-            stdscr.addstr(render_y, render_x, display_text, curses.color_pair(self.color_pair))
+            stdscr.addstr(render_y, render_x, display_text, resolve(self.color_pair))
         except curses.error: pass
 
+    def bounds(self, max_y: int, max_x: int) -> tuple[int, int, int, int]:
+        width = self.width if self.width is not None else len(str(self.text))
+        return (self.y, self.x, 1, width)
+
 class Box(Widget):
+    _render_attrs = Widget._render_attrs | {'color_pair'}
+
     def __init__(self, x: int = 0, y: int = 0, width: int = 10, height: int = 5, color_pair: int = 1):
         super().__init__(x, y, width, height)
         self.color_pair = color_pair
@@ -40,7 +60,7 @@ class Box(Widget):
         actual_h = end_y - self.y + 1
         actual_w = end_x - self.x + 1
         if actual_w < 2 or actual_h < 2: return
-        pair = curses.color_pair(self.color_pair)
+        pair = resolve(self.color_pair)
         
         try:
             stdscr.addstr(self.y, self.x + 1, '─' * (actual_w - 2), pair)
@@ -55,6 +75,9 @@ class Box(Widget):
         except curses.error: pass
 
 class Button(Widget):
+    _render_attrs = Widget._render_attrs | {'_label', 'color_pair', 'highlight_color_pair', 'focused'}
+    focusable = True
+
     def __init__(self, text: str, x: int = 0, y: int = 0, on_click: callable | None = None, color_pair: int = 1, highlight_color_pair: int = 3):
         super().__init__(x, y, width=len(text) + 4, height=1) 
         self._label = text
@@ -67,6 +90,10 @@ class Button(Widget):
     def text(self) -> str:
         return self._label.center(self.width) if self.width else f"  {self._label}  "
 
+    def bounds(self, max_y: int, max_x: int) -> tuple[int, int, int, int]:
+        # A label longer than width is drawn in full.
+        return (self.y, self.x, 1, len(self.text))
+
     def handle_event(self, event: object) -> bool:
         if not self.focused or event.type != 'key':
             return False
@@ -90,15 +117,18 @@ class Button(Widget):
             display_text = display_text[:max_x - render_x]
         
         if self.focused:
-            attr = curses.color_pair(self.highlight_color_pair) | curses.A_BOLD | curses.A_REVERSE
+            attr = resolve(self.highlight_color_pair) | curses.A_BOLD | curses.A_REVERSE
         else:
-            attr = curses.color_pair(self.color_pair)
+            attr = resolve(self.color_pair)
             
         try:
             stdscr.addstr(render_y, render_x, display_text, attr)
         except curses.error: pass
 
 class TextInput(Widget):
+    _render_attrs = Widget._render_attrs | {'_text', '_cursor_pos', 'color_pair', 'highlight_color_pair', 'focused'}
+    focusable = True
+
     def __init__(self, text: str = "", x: int = 0, y: int = 0, width: int = 20, color_pair: int = 1, highlight_color_pair: int = 3):
         super().__init__(x, y, width, height=1)
         self._text = text
@@ -116,7 +146,15 @@ class TextInput(Widget):
         self._text = str(value)
         self._cursor_pos = len(self._text) 
 
+    def insert(self, text: str) -> None:
+        text = ' '.join(str(text).splitlines())
+        self._text = self._text[:self._cursor_pos] + text + self._text[self._cursor_pos:]
+        self._cursor_pos += len(text)
+
     def handle_event(self, event: object) -> bool:
+        if self.focused and event.type == 'paste':
+            self.insert(event.data['text'])
+            return True
         if not self.focused or event.type != 'key':
             return False
         key = event.data['code']
@@ -158,24 +196,138 @@ class TextInput(Widget):
         display_text = display_text.ljust(self.width)
         
         if self.focused:
-            attr = curses.color_pair(self.highlight_color_pair) | curses.A_BOLD
+            attr = resolve(self.highlight_color_pair) | curses.A_BOLD
         else:
-            attr = curses.color_pair(self.color_pair)
+            attr = resolve(self.color_pair)
 
         try:
             stdscr.addstr(render_y, render_x, display_text, attr)
             if self.focused and render_y < max_y and render_x + (self._cursor_pos - start_display_idx) < max_x:
-                curses.curs_set(1) 
+                curs_set(1) 
                 stdscr.move(render_y, render_x + (self._cursor_pos - start_display_idx))
             else:
-                curses.curs_set(0) 
+                curs_set(0) 
         except curses.error:
-            curses.curs_set(0) 
+            curs_set(0) 
             pass
 
-class List(Widget):
-    def __init__(self, items: list[str], x: int = 0, y: int = 0, width: int = 20, height: int = 5, color_pair: int = 1, highlight_color_pair: int = 3, on_select: callable | None = None):
+class ListDataSource:
+    # Lazy row provider for List: len() is the row count, fetch(start, stop) returns rows start..stop-1.
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def fetch(self, start: int, stop: int) -> list:
+        raise NotImplementedError
+
+class _RowCache:
+    def __init__(self, source: ListDataSource, page_size: int, max_pages: int):
+        self.source = source
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._pages: OrderedDict[int, list[str]] = OrderedDict()
+
+    def _page(self, page: int) -> list[str]:
+        rows = self._pages.get(page)
+        if rows is not None:
+            self._pages.move_to_end(page)
+            return rows
+        start = page * self.page_size
+        rows = [str(row) for row in self.source.fetch(start, min(len(self.source), start + self.page_size))]
+        self._pages[page] = rows
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return rows
+
+    def __getitem__(self, idx: int) -> str:
+        return self._page(idx // self.page_size)[idx % self.page_size]
+
+    def prefetch(self, first: int, last: int, direction: int) -> None:
+        # Load the neighbouring page once the window is within a quarter page of its edge.
+        margin = self.page_size // 4
+        if direction > 0:
+            page = (last + margin) // self.page_size
+        else:
+            page = (first - margin) // self.page_size
+        if 0 <= page * self.page_size < len(self.source) and page not in self._pages:
+            self._page(page)
+
+    def clear(self) -> None:
+        self._pages.clear()
+
+class _FilterIndex:
+    # Case-folded rows joined by NUL, plus each row's start offset. Selective queries are located
+    # with str.find over the joined text (C speed, cost proportional to the hits); unselective ones
+    # fall back to a per-row scan. Extending a query only rescans the previous result set.
+    def __init__(self, items: list):
+        self.folded = [str(item).casefold().replace('\0', ' ') for item in items]
+        self.text = '\0'.join(self.folded) + '\0'
+        self.offsets = array('Q', [0])
+        self.offsets.extend(accumulate(len(row) + 1 for row in self.folded))
+
+    def search(self, query: str) -> list[int] | range:
+        count = len(self.folded)
+        if not query:
+            return range(count)
+        if self.text.count(query) > count // 4:
+            return [i for i, row in enumerate(self.folded) if query in row]
+        text, offsets, matches = self.text, self.offsets, []
+        pos = text.find(query)
+        while pos != -1:
+            i = bisect_right(offsets, pos) - 1
+            matches.append(i)
+            pos = text.find(query, offsets[i + 1])
+        return matches
+
+    def refine(self, matches: list[int] | range, query: str) -> list[int]:
+        folded = self.folded
+        return [i for i in matches if query in folded[i]]
+
+class _Scrollable(Widget):
+    # Rows are drawn once into a Pad under their row number and copied into the frame from there.
+    # Assigning one of _view_attrs only moves the viewport and keeps the drawn rows; assigning
+    # another display attribute drops them. An explicit invalidate() means the data may have
+    # changed in place, so subclasses also drop whatever they derived from it.
+    _view_attrs: frozenset[str] = frozenset()
+
+    def __init__(self, x: int = 0, y: int = 0, width: int | None = None, height: int | None = None):
+        self._pad = Pad()
         super().__init__(x, y, width, height)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        view = name in self._view_attrs
+        if not view and name not in self._render_attrs:
+            object.__setattr__(self, name, value)
+            return
+        old = self.__dict__.get(name, _UNSET)
+        object.__setattr__(self, name, value)
+        if old is not value and (type(old) not in _SCALAR_TYPES or old != value):
+            if view:
+                self._view_changed()
+            else:
+                self._redraw()
+
+    def _view_changed(self) -> None:
+        Widget.invalidate(self)
+
+    def _redraw(self) -> None:
+        self._pad.reset()
+        Widget.invalidate(self)
+
+    def invalidate(self) -> None:
+        self._redraw()
+
+class List(_Scrollable):
+    _render_attrs = Widget._render_attrs | {'items', '_filter_query', 'color_pair', 'highlight_color_pair'}
+    # The selected row is drawn straight into the frame; every other row comes from the pad.
+    _view_attrs = frozenset({'selected_idx', '_scroll_offset', 'focused'})
+    focusable = True
+
+    def __init__(self, items: list[str] | ListDataSource, x: int = 0, y: int = 0, width: int = 20, height: int = 5, color_pair: int = 1, highlight_color_pair: int = 3, on_select: callable | None = None, page_size: int = 256, cache_pages: int = 32, prefetch: bool = True):
+        super().__init__(x, y, width, height)
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self.prefetch = prefetch
+        self._filter_query: str | None = None
         self.items = items
         self.selected_idx: int = 0
         self.color_pair = color_pair
@@ -183,24 +335,122 @@ class List(Widget):
         self.on_select = on_select
         self.focused: bool = False
         self._scroll_offset: int = 0
+        self._scroll_direction: int = 1
+
+    @property
+    def items(self) -> list[str] | ListDataSource:
+        return self._items
+
+    @items.setter
+    def items(self, items: list[str] | ListDataSource) -> None:
+        self._items = items
+        self._rows = _RowCache(items, self.page_size, self.cache_pages) if hasattr(items, 'fetch') else items
+        self.filterable = not isinstance(self._rows, _RowCache)
+        self._reset_filter()
+        self.invalidate()
+
+    def reload(self) -> None:
+        if isinstance(self._rows, _RowCache):
+            self._rows.clear()
+        self._reset_filter()
+        self.selected_idx = min(self.selected_idx, max(0, len(self._items) - 1))
+        self.invalidate()
+
+    def _reset_filter(self) -> None:
+        self._filter_index: _FilterIndex | None = None
+        self._filter_stack: list[tuple[str, list[int] | range]] = []
+        self._matches: list[int] | range | None = None
+        self._filter_query = None
+
+    def set_filter(self, query: str | None) -> None:
+        if query is None:
+            if self._matches is not None and self._matches:
+                self.selected_idx = self._matches[min(self.selected_idx, len(self._matches) - 1)]
+                self._scroll_offset = max(0, self.selected_idx - self.height + 1)
+            self._filter_stack = []
+            self._matches = None
+            self._filter_query = None
+            return
+        if self._filter_index is None:
+            self._filter_index = _FilterIndex(self._items)
+        folded = query.casefold()
+        stack = self._filter_stack
+        while stack and not folded.startswith(stack[-1][0]):
+            stack.pop()
+        if not stack or stack[-1][0] != folded:
+            matches = self._filter_index.refine(stack[-1][1], folded) if stack and stack[-1][0] else self._filter_index.search(folded)
+            stack.append((folded, matches))
+        self._matches = stack[-1][1]
+        self._filter_query = query
+        self.selected_idx = 0
+        self._scroll_offset = 0
+        self._redraw()
+
+    def invalidate(self) -> None:
+        # After in-place changes to the items the filter index is stale: rebuild it and apply an
+        # active filter again.
+        if getattr(self, '_filter_index', None) is not None:
+            query = self._filter_query
+            self._reset_filter()
+            if query is not None:
+                self.set_filter(query)
+        super().invalidate()
+
+    def _view_len(self) -> int:
+        return len(self._matches) if self._matches is not None else len(self._items)
+
+    def _view_row(self, idx: int) -> str:
+        return self._rows[self._matches[idx]] if self._matches is not None else self._rows[idx]
+
+    def _list_height(self) -> int:
+        return self.height - 1 if self._filter_query is not None else self.height
+
+    def _handle_filter_key(self, event: object) -> bool:
+        query = self._filter_query
+        if event.type == 'paste':
+            self.set_filter(query + ' '.join(event.data['text'].splitlines()))
+            return True
+        key, char = event.data['code'], event.data.get('char')
+        if key == 27:
+            self.set_filter(None)
+        elif key == curses.KEY_BACKSPACE or key == ord('\x7f') or key == ord('\x08'):
+            self.set_filter(query[:-1] if query else None)
+        elif char:
+            self.set_filter(query + char)
+        else:
+            return False
+        return True
 
     def handle_event(self, event: object) -> bool:
-        if not self.focused or event.type != 'key' or not self.items:
+        if not self.focused or event.type not in ('key', 'paste'):
+            return False
+        filtering = self._filter_query is not None
+        if filtering and self._handle_filter_key(event):
+            return True
+        if event.type != 'key':
             return False
         key = event.data['code']
-        if key == curses.KEY_UP or key == ord('k'):
+        if key == ord('/') and self.filterable and not filtering:
+            self.set_filter('')
+            return True
+        if not self._view_len():
+            return False
+        height = self._list_height()
+        if key == curses.KEY_UP or (key == ord('k') and not filtering):
             self.selected_idx = max(0, self.selected_idx - 1)
+            self._scroll_direction = -1
             if self.selected_idx < self._scroll_offset:
                 self._scroll_offset = self.selected_idx
             return True
-        elif key == curses.KEY_DOWN or key == ord('j'):
-            self.selected_idx = min(len(self.items) - 1, self.selected_idx + 1)
-            if self.selected_idx >= self._scroll_offset + self.height:
-                self._scroll_offset = self.selected_idx - self.height + 1
+        elif key == curses.KEY_DOWN or (key == ord('j') and not filtering):
+            self.selected_idx = min(self._view_len() - 1, self.selected_idx + 1)
+            self._scroll_direction = 1
+            if self.selected_idx >= self._scroll_offset + height:
+                self._scroll_offset = self.selected_idx - height + 1
             return True
         elif key == ord('\n') or key == ord('\r'):
             if self.on_select:
-                self.on_select(self.items[self.selected_idx])
+                self.on_select(self._view_row(self.selected_idx))
             return True
         return False
 
@@ -209,31 +459,42 @@ class List(Widget):
             return
         render_y_start = min(self.y, max_y - 1)
         render_x_start = min(self.x, max_x - 1)
-        actual_height = min(self.height, max_y - render_y_start)
+        actual_height = min(self._list_height(), max_y - render_y_start)
         actual_width = min(self.width, max_x - render_x_start)
+        total = self._view_len()
+        normal = resolve(self.color_pair)
+        pad = self._pad
+        pad.prepare(actual_width, actual_height, registry.evictions)
         for i in range(actual_height):
             item_idx = self._scroll_offset + i
-            if item_idx >= len(self.items):
+            if item_idx >= total:
                 break
             y_pos = render_y_start + i
-            is_selected = (item_idx == self.selected_idx)
-            
-            indicator = "> " if is_selected else "  "
-            display_text = (indicator + str(self.items[item_idx])).ljust(actual_width)[:actual_width]
-            
-            if is_selected:
+            try:
+                if item_idx != self.selected_idx:
+                    if not pad.has(item_idx):
+                        display_text = ("  " + str(self._view_row(item_idx))).ljust(actual_width)[:actual_width]
+                        pad.addstr(pad.line(item_idx), 0, display_text, normal)
+                    pad.show(item_idx, stdscr, y_pos, render_x_start)
+                    continue
+                display_text = ("> " + str(self._view_row(item_idx))).ljust(actual_width)[:actual_width]
                 if self.focused:
-                    attr = curses.color_pair(self.highlight_color_pair) | curses.A_BOLD | curses.A_REVERSE
+                    attr = resolve(self.highlight_color_pair) | curses.A_BOLD | curses.A_REVERSE
                 else:
-                    attr = curses.color_pair(self.color_pair) | curses.A_BOLD
-            else:
-                attr = curses.color_pair(self.color_pair)
-                
-            try:
+                    attr = normal | curses.A_BOLD
                 stdscr.addstr(y_pos, render_x_start, display_text, attr)
             except curses.error: pass
+        if self._filter_query is not None and render_y_start + actual_height < max_y:
+            prompt = f"/{self._filter_query} ({total})".ljust(actual_width)[:actual_width]
+            try: stdscr.addstr(render_y_start + actual_height, render_x_start, prompt, resolve(self.highlight_color_pair))
+            except curses.error: pass
+        if self.prefetch and isinstance(self._rows, _RowCache):
+            self._rows.prefetch(self._scroll_offset, self._scroll_offset + actual_height - 1, self._scroll_direction)
 
 class Select(Widget):
+    _render_attrs = Widget._render_attrs | {'options', 'selected_idx', 'color_pair', 'highlight_color_pair', 'focused'}
+    focusable = True
+
     def __init__(self, options: list[str], x: int = 0, y: int = 0, width: int = 20, color_pair: int = 1, highlight_color_pair: int = 3, on_change: callable | None = None):
         super().__init__(x, y, width, height=1)
         self.options = options
@@ -269,12 +530,15 @@ class Select(Widget):
             return
         current_choice = self.options[self.selected_idx] if self.options else ""
         display_text = f"< {current_choice} >".center(self.width)[:self.width]
-        color = curses.color_pair(self.highlight_color_pair) if self.focused else curses.color_pair(self.color_pair)
+        color = resolve(self.highlight_color_pair) if self.focused else resolve(self.color_pair)
         try:
             stdscr.addstr(render_y, render_x, display_text, color)
         except curses.error: pass
 
 class Checkbox(Widget):
+    _render_attrs = Widget._render_attrs | {'label', 'checked', 'color_pair', 'highlight_color_pair', 'focused'}
+    focusable = True
+
     def __init__(self, label: str, x: int = 0, y: int = 0, checked: bool = False, color_pair: int = 1, highlight_color_pair: int = 3, on_change: callable | None = None):
         super().__init__(x, y, width=len(label) + 4, height=1)
         self.label = label
@@ -294,6 +558,10 @@ class Checkbox(Widget):
             return True
         return False
 
+    def bounds(self, max_y: int, max_x: int) -> tuple[int, int, int, int]:
+        # What render draws for the current label; width only reflects the initial one.
+        return (self.y, self.x, 1, len(self.label) + 4)
+
     def render(self, stdscr: object, max_y: int, max_x: int) -> None:
         if not self.visible:
             return
@@ -303,60 +571,107 @@ class Checkbox(Widget):
             return
         box_str = "[X]" if self.checked else "[ ]"
         display_text = f"{box_str} {self.label}"
-        color = curses.color_pair(self.highlight_color_pair) if self.focused else curses.color_pair(self.color_pair)
+        color = resolve(self.highlight_color_pair) if self.focused else resolve(self.color_pair)
         try:
             stdscr.addstr(render_y, render_x, display_text, color)
         except curses.error: pass
 
-class VStack(Widget):
+class _Stack(Widget):
+    _render_attrs = Widget._render_attrs | {'spacing'}
+
     def __init__(self, widgets: list[Widget], x: int = 0, y: int = 0, spacing: int = 0):
         super().__init__(x, y)
         self.widgets = widgets
         self.spacing = spacing
 
+    @property
+    def widgets(self) -> list[Widget]:
+        return self._widgets
+
+    @widgets.setter
+    def widgets(self, widgets: list[Widget]) -> None:
+        self._widgets = widgets
+        for widget in widgets:
+            widget.parent = self
+        tree_changed()
+        self.invalidate()
+
+    def children(self) -> list[Widget]:
+        return self._widgets
+
     def _update_child_positions(self) -> None:
-        current_y = self.y
-        for widget in self.widgets:
-            widget.x, widget.y = self.x, current_y
-            current_y += (widget.height if widget.height is not None else 1) + self.spacing
+        raise NotImplementedError
+
+    def _invalidate_child(self, widget: Widget) -> None:
+        self._child_dirty = True
+        if self.parent is not None:
+            self.parent._invalidate_child(self)
+
+    def bounds(self, max_y: int, max_x: int) -> tuple[int, int, int, int]:
+        self._update_child_positions()
+        y0, x0, y1, x1 = self.y, self.x, self.y, self.x
+        for widget in self._widgets:
+            if not widget.visible:
+                continue
+            y, x, h, w = widget.bounds(max_y, max_x)
+            y0, x0, y1, x1 = min(y0, y), min(x0, x), max(y1, y + h), max(x1, x + w)
+        return (y0, x0, y1 - y0, x1 - x0)
+
+    def _collect_damage(self, damage: list[tuple[int, int, int, int]], max_y: int, max_x: int) -> None:
+        if self._dirty or not self.visible:
+            super()._collect_damage(damage, max_y, max_x)
+            return
+        self._update_child_positions()
+        for widget in self._widgets:
+            if widget._dirty or widget._child_dirty:
+                widget._collect_damage(damage, max_y, max_x)
+
+    def _repaint(self, stdscr: object, max_y: int, max_x: int, damage: list[tuple[int, int, int, int]]) -> None:
+        if self._dirty or not self.visible:
+            Widget._repaint(self, stdscr, max_y, max_x, damage)
+            return
+        # Children extend damage as they repaint, so later siblings drawn over them follow.
+        for widget in self._widgets:
+            if widget._dirty or widget._child_dirty or _intersects(widget._bounds, damage):
+                widget._repaint(stdscr, max_y, max_x, damage)
+        self._bounds = self.bounds(max_y, max_x)
+        self._dirty = self._child_dirty = False
 
     def render(self, stdscr: object, max_y: int, max_x: int) -> None:
         if not self.visible:
             return
         self._update_child_positions()
-        for widget in self.widgets:
-            widget.render(stdscr, max_y, max_x)
+        for widget in self._widgets:
+            widget._paint(stdscr, max_y, max_x)
 
     def handle_event(self, event: object) -> bool:
-        for widget in self.widgets:
+        for widget in self._widgets:
             if widget.handle_event(event): return True
         return False
 
-class HStack(Widget):
+class VStack(_Stack):
+    def __init__(self, widgets: list[Widget], x: int = 0, y: int = 0, spacing: int = 0):
+        super().__init__(widgets, x, y, spacing)
+
+    def _update_child_positions(self) -> None:
+        current_y = self.y
+        for widget in self._widgets:
+            widget.x, widget.y = self.x, current_y
+            current_y += (widget.height if widget.height is not None else 1) + self.spacing
+
+class HStack(_Stack):
     def __init__(self, widgets: list[Widget], x: int = 0, y: int = 0, spacing: int = 1):
-        super().__init__(x, y)
-        self.widgets = widgets
-        self.spacing = spacing
+        super().__init__(widgets, x, y, spacing)
 
     def _update_child_positions(self) -> None:
         current_x = self.x
-        for widget in self.widgets:
+        for widget in self._widgets:
             widget.x, widget.y = current_x, self.y
             current_x += (widget.width if widget.width is not None else 10) + self.spacing
 
-    def render(self, stdscr: object, max_y: int, max_x: int) -> None:
-        if not self.visible:
-            return
-        self._update_child_positions()
-        for widget in self.widgets:
-            widget.render(stdscr, max_y, max_x)
-
-    def handle_event(self, event: object) -> bool:
-        for widget in self.widgets:
-            if widget.handle_event(event): return True
-        return False
-
 class Frame(Box):
+    _render_attrs = Box._render_attrs | {'title'}
+
     def __init__(self, title: str = "", x: int = 0, y: int = 0, width: int = 10, height: int = 5, color_pair: int = 1):
         super().__init__(x, y, width, height, color_pair)
         self.title = title
@@ -369,10 +684,12 @@ class Frame(Box):
         if len(display_title) > self.width - 2:
             display_title = display_title[:self.width - 2]
         try:
-            stdscr.addstr(self.y, self.x + 2, display_title, curses.color_pair(self.color_pair))
+            stdscr.addstr(self.y, self.x + 2, display_title, resolve(self.color_pair))
         except curses.error: pass
 
 class Dialog(Widget):
+    _render_attrs = Widget._render_attrs | {'title', 'message'}
+
     def __init__(self, title: str, message: str, on_yes: callable, on_no: callable | None = None):
         super().__init__()
         self.title = title
@@ -383,8 +700,13 @@ class Dialog(Widget):
         self.no_btn = Button("NO", on_click=on_no) if on_no else None
         self.yes_btn.focused = True
         if self.no_btn: self.no_btn.focused = False
+        self.yes_btn.parent = self
+        if self.no_btn: self.no_btn.parent = self
         self._cached_layout = None
 
+    def children(self) -> list[Widget]:
+        return [self.yes_btn, self.no_btn] if self.no_btn else [self.yes_btn]
+
     def handle_event(self, event: object) -> bool:
         if event.type != 'key': return False
         key = event.data['code']
@@ -408,22 +730,31 @@ class Dialog(Widget):
         x, y = (max_x - w) // 2, (max_y - h) // 2
         return {'x': x, 'y': y, 'w': w, 'h': h, 'lines': lines}
 
+    def bounds(self, max_y: int, max_x: int) -> tuple[int, int, int, int]:
+        l = self._calculate_layout(max_y, max_x)
+        return (l['y'], l['x'], l['h'], l['w'])
+
     def render(self, stdscr: object, max_y: int, max_x: int) -> None:
-        if self._cached_layout is None or self._cached_layout['max_size'] != (max_y, max_x):
+        # The frame and message labels are built with the layout and reused until the size or text changes.
+        key = (max_y, max_x, self.title, self.message)
+        if self._cached_layout is None or self._cached_layout['key'] != key:
             layout = self._calculate_layout(max_y, max_x)
-            layout['max_size'] = (max_y, max_x)
+            x, y, w, h = layout['x'], layout['y'], layout['w'], layout['h']
+            layout['key'] = key
+            layout['frame'] = Frame(self.title, x, y, w, h, color_pair=4)
+            layout['labels'] = [Label(line.center(w - 4), x + 2, y + 2 + i, width=w - 4) for i, line in enumerate(layout['lines']) if i + 2 < h - 2]
             self._cached_layout = layout
         
         l = self._cached_layout
-        x, y, w, h, lines = l['x'], l['y'], l['w'], l['h'], l['lines']
+        x, y, w, h = l['x'], l['y'], l['w'], l['h']
         
+        blank, attr = " " * w, resolve(1)
         for i in range(h):
-            try: stdscr.addstr(y + i, x, " " * w, curses.color_pair(1))
+            try: stdscr.addstr(y + i, x, blank, attr)
             except curses.error: pass
-        Frame(self.title, x, y, w, h, color_pair=4).render(stdscr, max_y, max_x)
-        for i, line in enumerate(lines):
-            if i + 2 < h - 2:
-                Label(line.center(w - 4), x + 2, y + 2 + i, width=w - 4).render(stdscr, max_y, max_x)
+        l['frame'].render(stdscr, max_y, max_x)
+        for label in l['labels']:
+            label.render(stdscr, max_y, max_x)
         if self.no_btn:
             self.yes_btn.x, self.yes_btn.y = x + w // 4 - 5, y + h - 2
             self.no_btn.x, self.no_btn.y = x + 3 * w // 4 - 5, y + h - 2
@@ -434,69 +765,87 @@ class Dialog(Widget):
             self.yes_btn.render(stdscr, max_y, max_x)
 
 class FormDialog(Widget):
+    _render_attrs = Widget._render_attrs | {'title'}
+
     def __init__(self, title: str, fields: list[tuple[str, Widget]], on_save: callable, on_cancel: callable):
         super().__init__()
         self.title = title
         self.fields = fields
         self.on_save = on_save
         self.on_cancel = on_cancel
-        self.focused_field_idx = 0
         self.save_btn = Button("SAVE", on_click=on_save)
         self.cancel_btn = Button("CANCEL", on_click=on_cancel)
-        self.save_btn.focused = False
-        self.cancel_btn.focused = False
-        self._update_focus()
+        for _, widget in fields:
+            widget.parent = self
+            if widget.focusable: widget.focused = False
+        self.save_btn.parent = self
+        self.cancel_btn.parent = self
+        self._focus = FocusManager(self, self.children)
+        tree_changed()
+        self.focused_field_idx = 0
         self._cached_layout = None
 
+    def children(self) -> list[Widget]:
+        return [widget for _, widget in self.fields] + [self.save_btn, self.cancel_btn]
+
+    @property
+    def focused_field_idx(self) -> int:
+        try:
+            return self.children().index(self._focus.focused)
+        except ValueError:
+            return 0
+
+    @focused_field_idx.setter
+    def focused_field_idx(self, idx: int) -> None:
+        self._focus.focus(self.children()[idx])
+
     def handle_event(self, event: object) -> bool:
+        if event.type == 'paste':
+            self._focus.route(event)
+            return True
         if event.type != 'key': return False
         key = event.data['code']
-        num_fields = len(self.fields)
         
         if key in [ord('\t'), curses.KEY_DOWN, ord('j')]:
-            self.focused_field_idx = (self.focused_field_idx + 1) % (num_fields + 2)
-            self._update_focus()
+            self._focus.focus_next()
             return True
         elif key in [curses.KEY_BTAB, curses.KEY_UP, ord('k')]:
-            self.focused_field_idx = (self.focused_field_idx - 1 + num_fields + 2) % (num_fields + 2)
-            self._update_focus()
+            self._focus.focus_prev()
             return True
             
-        if self.focused_field_idx < num_fields:
-            if self.fields[self.focused_field_idx][1].handle_event(event): return True
-        elif self.focused_field_idx == num_fields:
-            if self.save_btn.handle_event(event): return True
-        else:
-            if self.cancel_btn.handle_event(event): return True
+        self._focus.route(event)
         return True
 
-    def _update_focus(self) -> None:
-        num_fields = len(self.fields)
-        for i, (_, w) in enumerate(self.fields):
-            w.focused = (i == self.focused_field_idx)
-        self.save_btn.focused = (self.focused_field_idx == num_fields)
-        self.cancel_btn.focused = (self.focused_field_idx == num_fields + 1)
-
     def _calculate_layout(self, max_y: int, max_x: int) -> dict:
         w = int(max_x * 0.9)
         h = min(max_y - 2, len(self.fields) + 10)
         x, y = (max_x - w) // 2, (max_y - h) // 2
         return {'x': x, 'y': y, 'w': w, 'h': h}
 
+    def bounds(self, max_y: int, max_x: int) -> tuple[int, int, int, int]:
+        l = self._calculate_layout(max_y, max_x)
+        return (l['y'], l['x'], l['h'], l['w'])
+
     def render(self, stdscr: object, max_y: int, max_x: int) -> None:
-        if self._cached_layout is None or self._cached_layout['max_size'] != (max_y, max_x):
-            self._cached_layout = self._calculate_layout(max_y, max_x)
-            self._cached_layout['max_size'] = (max_y, max_x)
+        key = (max_y, max_x, self.title)
+        if self._cached_layout is None or self._cached_layout['key'] != key:
+            layout = self._calculate_layout(max_y, max_x)
+            x, y, w, h = layout['x'], layout['y'], layout['w'], layout['h']
+            layout['key'] = key
+            layout['frame'] = Frame(self.title, x, y, w, h, color_pair=2)
+            layout['labels'] = [Label(f"{label}:", x + 4, y + 3 + i) for i, (label, _) in enumerate(self.fields)]
+            self._cached_layout = layout
         
         l = self._cached_layout
         x, y, w, h = l['x'], l['y'], l['w'], l['h']
         
+        blank, attr = " " * w, resolve(1)
         for i in range(h):
-            try: stdscr.addstr(y + i, x, " " * w, curses.color_pair(1))
+            try: stdscr.addstr(y + i, x, blank, attr)
             except curses.error: pass
-        Frame(self.title, x, y, w, h, color_pair=2).render(stdscr, max_y, max_x)
-        for i, (label, widget) in enumerate(self.fields):
-            Label(f"{label}:", x + 4, y + 3 + i).render(stdscr, max_y, max_x)
+        l['frame'].render(stdscr, max_y, max_x)
+        for i, (label, (_, widget)) in enumerate(zip(l['labels'], self.fields)):
+            label.render(stdscr, max_y, max_x)
             widget.x, widget.y = x + 25, y + 3 + i
             widget.width = w - 30
             widget.render(stdscr, max_y, max_x)
@@ -505,27 +854,271 @@ class FormDialog(Widget):
         self.save_btn.render(stdscr, max_y, max_x)
         self.cancel_btn.render(stdscr, max_y, max_x)
 
-class LogDisplay(Widget):
-    def __init__(self, x: int = 0, y: int = 0, width: int = 50, height: int = 10, color_pair: int = 1):
+_ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+def _clean_log_line(message: object, ansi_colors: bool = False) -> tuple[str, tuple[int, ...] | None] | None:
+    # Returns the plain text and, with ansi_colors, its SGR runs (see lokutui.ansi.parse_ansi).
+    line = str(message)
+    if '\r' in line:
+        line = line.rpartition('\r')[2]
+    runs = None
+    if '\x1b' in line:
+        if ansi_colors:
+            line, runs = parse_ansi(line)
+        else:
+            line = _ANSI_ESCAPE.sub('', line)
+    return (line, runs) if line and not line.isspace() else None
+
+class _LogSearch:
+    # Matches of one query as absolute line numbers, plus how far into the history it has looked;
+    # catching up after new lines only tests the lines past `scanned`.
+    def __init__(self, query: str, regex: bool, ignore_case: bool):
+        self.query, self.regex, self.ignore_case = query, regex, ignore_case
+        source = query if regex else re.escape(query)
+        flags = re.IGNORECASE if ignore_case else 0
+        self.pattern = re.compile(source, flags)
+        # Spilled lines are searched in the raw file only for literals, which cannot span lines and
+        # match the same bytes (IGNORECASE folds only ASCII on bytes); anything else is tested per line.
+        if not regex and '\n' not in query and (not ignore_case or query.isascii()):
+            self.disk_pattern = re.compile(source.encode('utf-8'), flags)
+        else:
+            self.disk_pattern = self.pattern
+        self.matches = array('Q')
+        self.scanned: int = 0
+
+    def discard_before(self, line_no: int) -> None:
+        # Matches on lines the ring has dropped are kept until they are most of the array, so
+        # trimming stays amortized O(1) per match however long the log runs.
+        first = bisect_left(self.matches, line_no)
+        if first > len(self.matches) // 2:
+            del self.matches[:first]
+
+    def extends(self, other: _LogSearch) -> bool:
+        return (not self.regex and not other.regex and self.ignore_case == other.ignore_case
+                and self.query.startswith(other.query))
+
+class LogDisplay(_Scrollable):
+    _render_attrs = Widget._render_attrs | {'filtered', 'color_pair', 'highlight_color_pair'}
+    # Pad rows are keyed by absolute line number, so they stay valid as lines arrive; the current
+    # match line is drawn straight into the frame.
+    _view_attrs = frozenset({'_scroll_offset', '_match_line'})
+
+    def __init__(self, x: int = 0, y: int = 0, width: int = 50, height: int = 10, color_pair: int = 1, max_messages: int = 1000, scrollback: bool | str = False, highlight_color_pair: int = 3, ansi_colors: bool = True):
         super().__init__(x, y, width, height)
-        self.messages = deque(maxlen=1000)
+        self.messages = deque(maxlen=max_messages)
+        # SGR runs parsed at ingest, parallel to messages (None for unstyled lines). Styling is
+        # not kept for lines spilled to scrollback.
+        self._styles = deque(maxlen=max_messages)
+        self.ansi_colors = ansi_colors
         self.color_pair = color_pair
+        self.highlight_color_pair = highlight_color_pair
         self._scroll_offset: int = 0
         self._auto_scroll: bool = True
+        self.lines_processed: int = 0
+        self.lines_dropped: int = 0
+        # Lines evicted from the ring spill to disk instead of being dropped; a str names the file.
+        self.scrollback: DiskScrollback | None = None
+        if scrollback:
+            self.scrollback = DiskScrollback(scrollback if isinstance(scrollback, str) else None)
+        # Absolute number of the oldest line still held; grows when the ring drops lines.
+        self._first_line: int = 0
+        self._searches: list[_LogSearch] = []
+        self._match_line: int | None = None
+        self.filtered: bool = False
+
+    @property
+    def total_lines(self) -> int:
+        return len(self.messages) + (len(self.scrollback) if self.scrollback is not None else 0)
+
+    def get_lines(self, start: int, stop: int) -> list[str]:
+        # Lines by position in the full history (scrollback first, then the ring).
+        spilled = len(self.scrollback) if self.scrollback is not None else 0
+        lines = self.scrollback.lines(start, min(stop, spilled)) if start < spilled else []
+        if stop > spilled:
+            lines.extend(islice(self.messages, max(0, start - spilled), stop - spilled))
+        return lines
+
+    def _line_at(self, position: int) -> str:
+        spilled = len(self.scrollback) if self.scrollback is not None else 0
+        return self.scrollback[position] if position < spilled else self.messages[position - spilled]
 
     def add_message(self, message: str) -> None:
-        clean_msg = str(message).split('\r')[-1]
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        clean_msg = ansi_escape.sub('', clean_msg)
-        
-        if clean_msg.strip():
-            self.messages.append(clean_msg)
-            if self._auto_scroll:
-                self._scroll_offset = 0
+        self.lines_processed += 1
+        cleaned = _clean_log_line(message, self.ansi_colors)
+        if cleaned is not None:
+            self._append_lines((cleaned[0],), (cleaned[1],))
+
+    def add_messages(self, messages: Iterable[str]) -> None:
+        # Only the newest lines that fit in the ring are cleaned; older ones in a burst are
+        # counted as dropped without being touched.
+        if not isinstance(messages, (list, tuple)):
+            messages = list(messages)
+        self.lines_processed += len(messages)
+        capacity = self.messages.maxlen if self.scrollback is None else None
+        kept, styles = [], []
+        examined = 0
+        ansi_colors = self.ansi_colors
+        for message in reversed(messages):
+            examined += 1
+            cleaned = _clean_log_line(message, ansi_colors)
+            if cleaned is not None:
+                kept.append(cleaned[0])
+                styles.append(cleaned[1])
+                if len(kept) == capacity:
+                    break
+        self.lines_dropped += len(messages) - examined
+        if kept:
+            kept.reverse()
+            styles.reverse()
+            self._append_lines(kept, styles)
+
+    def _append_lines(self, lines: list[str] | tuple[str, ...], styles: list | tuple) -> None:
+        capacity = self.messages.maxlen
+        overflow = max(0, len(self.messages) + len(lines) - capacity) if capacity is not None else 0
+        if overflow and self.scrollback is not None:
+            evicted = list(islice(self.messages, min(overflow, len(self.messages))))
+            evicted.extend(lines[:overflow - len(evicted)])
+            self.scrollback.append(evicted)
+        else:
+            self.lines_dropped += overflow
+            self._first_line += overflow
+        self.messages.extend(lines)
+        self._styles.extend(styles)
+        if self._searches:
+            self._catch_up(self._searches[-1])
+        if self._auto_scroll:
+            self._scroll_offset = 0
+        elif self.scrollback is not None or self.filtered:
+            # Keep the scrolled-back view pinned on the same lines while new ones arrive.
+            self._scroll_offset = min(self._scroll_offset + len(lines), max(0, self._view_total() - self.height))
+        self._view_changed()
+
+    def _catch_up(self, search: _LogSearch) -> None:
+        search.discard_before(self._first_line)
+        end = self._first_line + self.total_lines
+        start = max(search.scanned, self._first_line)
+        if start >= end:
+            search.scanned = end
+            return
+        spilled = len(self.scrollback) if self.scrollback is not None else 0
+        base = self._first_line
+        if start - base < spilled:
+            search.matches.extend(base + i for i in self.scrollback.find_lines(search.disk_pattern, start - base, spilled))
+            start = base + spilled
+        pattern = search.pattern
+        for i, line in enumerate(islice(self.messages, start - base - spilled, None), start):
+            if pattern.search(line):
+                search.matches.append(i)
+        search.scanned = end
+
+    def search(self, query: str | None, regex: bool = False, ignore_case: bool = False) -> int:
+        # Returns the match count. A query extending the previous one only re-tests its matches,
+        # and going back to an earlier prefix reuses that prefix's index.
+        if not query:
+            self._searches = []
+            self._match_line = None
+            self.set_filtered(False)
+            self.invalidate()
+            return 0
+        search = _LogSearch(query, regex, ignore_case)
+        stack = self._searches
+        while stack and not search.extends(stack[-1]):
+            stack.pop()
+        if stack and stack[-1].query == query:
+            search = stack[-1]
+        elif stack and len(stack[-1].matches) < self.total_lines // 8:
+            previous = stack[-1]
+            self._catch_up(previous)
+            base = self._first_line
+            spilled = len(self.scrollback) if self.scrollback is not None else 0
+            candidates = islice(previous.matches, bisect_left(previous.matches, base), None)
+            on_disk, in_ring = [], []
+            for line_no in candidates:
+                (on_disk if line_no - base < spilled else in_ring).append(line_no)
+            if on_disk:
+                search.matches.extend(base + i for i in self.scrollback.filter_lines(search.disk_pattern, [n - base for n in on_disk]))
+            pattern, messages = search.pattern, self.messages
+            search.matches.extend(n for n in in_ring if pattern.search(messages[n - base - spilled]))
+            search.scanned = previous.scanned
+            stack.append(search)
+        else:
+            # Nothing to refine, or so many candidates that a fresh scan of the history is cheaper.
+            stack.append(search)
+        self._catch_up(search)
+        self._match_line = None
+        if self.filtered:
+            self._scroll_offset = 0
+        self.invalidate()
+        return self.match_count
+
+    def _valid_matches(self) -> tuple[array, int]:
+        matches = self._searches[-1].matches if self._searches else array('Q')
+        return matches, bisect_left(matches, self._first_line)
+
+    @property
+    def match_count(self) -> int:
+        matches, first = self._valid_matches()
+        return len(matches) - first
+
+    def set_filtered(self, filtered: bool) -> None:
+        # Show only the lines matching the current search.
+        filtered = filtered and bool(self._searches)
+        if filtered != self.filtered:
+            self.filtered = filtered
+            self._scroll_offset = 0
+            self._auto_scroll = True
+
+    def jump_to_match(self, index: int) -> bool:
+        matches, first = self._valid_matches()
+        count = len(matches) - first
+        if not count:
+            return False
+        index = index % count
+        self._match_line = matches[first + index]
+        position = index if self.filtered else self._match_line - self._first_line
+        self._auto_scroll = False
+        self._scroll_offset = max(0, self._view_total() - self.height - position)
+        if self._scroll_offset == 0:
+            self._auto_scroll = True
+        return True
+
+    def find_next(self) -> bool:
+        matches, first = self._valid_matches()
+        if len(matches) == first:
+            return False
+        if self._match_line is None:
+            return self.jump_to_match(0)
+        return self.jump_to_match(bisect_right(matches, self._match_line) - first)
+
+    def find_prev(self) -> bool:
+        matches, first = self._valid_matches()
+        if len(matches) == first:
+            return False
+        if self._match_line is None:
+            return self.jump_to_match(-1)
+        return self.jump_to_match(bisect_left(matches, self._match_line) - first - 1)
+
+    def _view_total(self) -> int:
+        return self.match_count if self.filtered else self.total_lines
+
+    def _view_numbers(self, start: int, stop: int) -> list[int] | range:
+        if not self.filtered:
+            return range(self._first_line + start, self._first_line + stop)
+        matches, first = self._valid_matches()
+        return matches[first + start:first + stop]
+
+    def _view_lines(self, start: int, stop: int) -> list[tuple[int, str]]:
+        if not self.filtered:
+            return list(enumerate(self.get_lines(start, stop), self._first_line + start))
+        matches, first = self._valid_matches()
+        view = []
+        for line_no in islice(matches, first + start, first + stop):
+            view.append((line_no, self._line_at(line_no - self._first_line)))
+        return view
 
     def scroll_up(self) -> None:
         self._auto_scroll = False
-        self._scroll_offset = min(self._scroll_offset + 1, max(0, len(self.messages) - self.height))
+        self._scroll_offset = min(self._scroll_offset + 1, max(0, self._view_total() - self.height))
 
     def scroll_down(self) -> None:
         self._scroll_offset = max(0, self._scroll_offset - 1)
@@ -543,22 +1136,60 @@ class LogDisplay(Widget):
         render_x_start = min(self.x, max_x - 1)
         actual_height = min(self.height, max_y - render_y_start)
         actual_width = min(self.width, max_x - render_x_start)
-        total_msgs = len(self.messages)
+        total_msgs = self._view_total()
         start_idx = max(0, total_msgs - actual_height - self._scroll_offset)
         end_idx = max(0, total_msgs - self._scroll_offset)
+        pad = self._pad
+        pad.prepare(actual_width, actual_height, registry.evictions)
+
+        # Only lines that are not drawn in the pad yet are fetched.
+        numbers = self._view_numbers(start_idx, end_idx)
+        missing = [i for i, line_no in enumerate(numbers) if line_no == self._match_line or not pad.has(line_no)]
+        lines = dict(self._view_lines(start_idx + missing[0], start_idx + missing[-1] + 1)) if missing else {}
+        matches, first = self._valid_matches() if self._searches and not self.filtered else (None, 0)
+        normal = resolve(self.color_pair)
+        highlight = resolve(self.highlight_color_pair)
+        ring_start = self._first_line + self.total_lines - len(self.messages)
+        styles = self._styles
         
-        from itertools import islice
-        display_lines = islice(self.messages, start_idx, end_idx)
-        
-        for i, line in enumerate(display_lines):
+        for i, line_no in enumerate(numbers):
             y_pos = render_y_start + i
             if y_pos >= render_y_start + actual_height:
                 break
             try:
-                stdscr.addstr(y_pos, render_x_start, str(line)[:actual_width], curses.color_pair(self.color_pair))
+                if line_no == self._match_line:
+                    stdscr.addstr(y_pos, render_x_start, str(lines[line_no])[:actual_width], highlight | curses.A_REVERSE)
+                    continue
+                if not pad.has(line_no):
+                    attr = normal
+                    if matches is not None:
+                        j = bisect_left(matches, line_no, first)
+                        if j < len(matches) and matches[j] == line_no:
+                            attr = highlight | curses.A_BOLD
+                    runs = styles[line_no - ring_start] if attr == normal and line_no >= ring_start else None
+                    self._draw_line(pad, pad.line(line_no), str(lines[line_no]), runs, attr, actual_width)
+                pad.show(line_no, stdscr, y_pos, render_x_start)
             except curses.error: pass
 
+    @staticmethod
+    def _draw_line(pad: Pad, y: int, line: str, runs: tuple[int, ...] | None, attr: int, width: int) -> None:
+        if runs is None:
+            pad.addstr(y, 0, line[:width], attr)
+            return
+        x = 0
+        for k in range(0, len(runs), 2):
+            if x >= width:
+                break
+            length = min(runs[k], width - x)
+            run_attr = style_attr(runs[k + 1])
+            if not run_attr & curses.A_COLOR:
+                run_attr |= attr
+            pad.addstr(y, x, line[x:x + length], run_attr)
+            x += length
+
 class ProgressBar(Widget):
+    _render_attrs = Widget._render_attrs | {'_percentage', 'fill_char', 'empty_char', 'color_pair'}
+
     def __init__(self, x: int = 0, y: int = 0, width: int = 30, percentage: float = 0.0, fill_char: str = '█', empty_char: str = '░', color_pair: int = 2):
         super().__init__(x, y, width, height=1)
         self._percentage = max(0.0, min(1.0, percentage)) 
@@ -576,76 +1207,147 @@ class ProgressBar(Widget):
         filled_cols = int(self._percentage * actual_width)
         bar_str = (self.fill_char * filled_cols) + (self.empty_char * (actual_width - filled_cols))
         try:
-            stdscr.addstr(render_y, render_x, bar_str[:actual_width], curses.color_pair(self.color_pair))
+            stdscr.addstr(render_y, render_x, bar_str[:actual_width], resolve(self.color_pair))
         except curses.error: pass
 
+# Braille glyph for every dot bitmask, and the bit of each dot by sub-column and dot row within
+# the cell (top first).
+_BRAILLE = ''.join(chr(0x2800 + bits) for bits in range(256))
+_BRAILLE_DOTS = ((0x01, 0x02, 0x04, 0x40), (0x08, 0x10, 0x20, 0x80))
+_MASK_TO_BRAILLE = str.maketrans({chr(bits): _BRAILLE[bits] for bits in range(256)})
+_BRAILLE_RUN = re.compile('[^\u2800]+')
+
+def _mask_runs(cells: bytearray) -> list[tuple[int, str]]:
+    # (offset, braille text) for each run of non-empty cells in a row of masks.
+    text = cells.decode('latin-1').translate(_MASK_TO_BRAILLE)
+    return [(run.start(), run.group()) for run in _BRAILLE_RUN.finditer(text)]
+
 class Chart(Widget):
-    def __init__(self, x: int = 0, y: int = 0, width: int = 50, height: int = 10, series_data: dict[str, list[float]] | None = None, color_pairs: dict[str, int] | None = None, y_range: tuple[float, float] | None = None):
+    _render_attrs = Widget._render_attrs | {'series_data', 'color_pairs', 'y_range'}
+
+    def __init__(self, x: int = 0, y: int = 0, width: int = 50, height: int = 10, series_data: dict[str, list[float] | ChartSeries] | None = None, color_pairs: dict[str, int] | None = None, y_range: tuple[float, float] | None = None, max_points: int = 10000):
         super().__init__(x, y, width, height)
         self.series_data = series_data if series_data is not None else {} 
         self.color_pairs = color_pairs if color_pairs is not None else {label: i+1 for i, label in enumerate(self.series_data.keys())}
         self.y_range = y_range 
+        self.max_points = max_points
         self.grid_char = '.' 
         self._cached_grid = None
         self._last_data_id = None
         self._last_size = (None, None)
+        self._last_range = (None, None)
+        self._data_range, self._range_id = (0, 1), None
+
+    def set_series(self, label: str, values: list[float] | ChartSeries) -> None:
+        self.series_data[label] = values
+        self.invalidate()
+
+    def add_point(self, label: str, value: float) -> None:
+        # New series are ChartSeries rings holding the last max_points samples.
+        series = self.series_data.get(label)
+        if series is None:
+            series = self.series_data[label] = ChartSeries(self.max_points)
+        series.append(value)
+        self.invalidate()
 
-    def _get_braille_char(self, points: list[bool]) -> str:
-        bitmask = 0
-        mapping = [0, 1, 2, 6, 3, 4, 5, 7]
-        for i, dot in enumerate(points):
-            if dot: bitmask |= (1 << mapping[i])
-        return chr(0x2800 + bitmask)
+    def _series_color(self, label: str) -> int:
+        color = self.color_pairs.get(label)
+        if color is None:
+            color = list(self.series_data).index(label) % 4 + 1 if label in self.series_data else 1
+        return color
+
+    def _build_rows(self, ah: int, aw: int, min_v: float, max_v: float) -> list[list[tuple[int, str, str]]]:
+        # One bytearray of braille bitmasks per series, then per row the runs of consecutive
+        # non-empty cells drawn by the same series as (x offset, text, label). Where series
+        # overlap the dots are merged and the later series' color wins.
+        layers = []
+        for label, s in self.series_data.items():
+            if not s: continue
+            # One (low, high) dot-row span per braille sub-column, min/max decimated.
+            lows, highs = column_extents(s, aw * 2, min_v, max_v, ah * 4)
+            cells = bytearray(ah * aw)
+            for cp, (lo, hi) in enumerate(zip(lows, highs)):
+                if lo < 0: continue
+                bits, ci = _BRAILLE_DOTS[cp % 2], cp // 2
+                for rp in range(lo, hi + 1):
+                    cells[(ah - 1 - (rp // 4)) * aw + ci] |= bits[3 - (rp % 4)]
+            layers.append((label, cells))
+        rows = []
+        for yo in range(ah):
+            runs = []
+            start = yo * aw
+            row_layers = [(label, cells[start:start + aw]) for label, cells in layers if any(cells[start:start + aw])]
+            if len(row_layers) == 1:
+                label, cells = row_layers[0]
+                runs.extend((xo, text, label) for xo, text in _mask_runs(cells))
+            elif row_layers:
+                run_x, run_label, chars = 0, None, []
+                for xo in range(aw):
+                    mask, owner = 0, None
+                    for label, cells in row_layers:
+                        if cells[xo]:
+                            mask |= cells[xo]
+                            owner = label
+                    if owner != run_label or not mask:
+                        if chars:
+                            runs.append((run_x, ''.join(chars), run_label))
+                        run_x, run_label, chars = xo, owner, []
+                    if mask:
+                        chars.append(_BRAILLE[mask])
+                if chars:
+                    runs.append((run_x, ''.join(chars), run_label))
+            rows.append(runs)
+        return rows
 
     def _get_data_id(self) -> tuple:
         ids = []
         for label, s in self.series_data.items():
-            ids.append((label, len(s), s[-1] if s else None))
+            if isinstance(s, ChartSeries):
+                ids.append((label, id(s), s.version))
+            else:
+                ids.append((label, len(s), s[-1] if s else None))
         return tuple(ids)
 
+    def _value_range(self) -> tuple[float, float]:
+        min_v, max_v = float('inf'), float('-inf')
+        for s in self.series_data.values():
+            if isinstance(s, ChartSeries):
+                if s.min is not None:
+                    min_v, max_v = min(min_v, s.min), max(max_v, s.max)
+            elif s:
+                min_v, max_v = min(min_v, min(s)), max(max_v, max(s))
+        return (min_v, max_v) if min_v != float('inf') else (0, 1)
+
     def render(self, stdscr: object, max_y: int, max_x: int) -> None:
         if not self.visible or self.width < 1 or self.height < 1: return
         ry, rx = min(self.y, max_y - 1), min(self.x, max_x - 1)
         ah, aw = min(self.height, max_y - ry), min(self.width, max_x - rx)
         
         for yo in range(ah):
-            try: stdscr.addstr(ry + yo, rx, " " * aw, curses.color_pair(1))
+            try: stdscr.addstr(ry + yo, rx, " " * aw, resolve(1))
             except curses.error: pass
             
-        min_v, max_v = self.y_range if self.y_range else (float('inf'), float('-inf'))
-        if not self.y_range:
-            for s in self.series_data.values():
-                if s: min_v, max_v = min(min_v, min(s)), max(max_v, max(s))
-            if min_v == float('inf'): min_v, max_v = 0, 1 
+        data_id = self._get_data_id()
+        if self.y_range:
+            min_v, max_v = self.y_range
+        else:
+            if data_id != self._range_id:
+                self._data_range, self._range_id = self._value_range(), data_id
+            min_v, max_v = self._data_range
         if max_v == min_v: max_v += 1.0
 
         try:
-            stdscr.addstr(ry, rx, f"{max_v:.2f}", curses.color_pair(2) | curses.A_DIM)
-            stdscr.addstr(ry + ah - 1, rx, f"{min_v:.2f}", curses.color_pair(2) | curses.A_DIM)
+            stdscr.addstr(ry, rx, f"{max_v:.2f}", resolve(2) | curses.A_DIM)
+            stdscr.addstr(ry + ah - 1, rx, f"{min_v:.2f}", resolve(2) | curses.A_DIM)
         except curses.error: pass
 
-        data_id = self._get_data_id()
-        if self._cached_grid is None or data_id != self._last_data_id or (ah, aw) != self._last_size:
-            grid = [[ [False] * 8 for _ in range(ah) ] for _ in range(aw)]
-            for label, s in self.series_data.items():
-                if not s: continue
-                for cp in range(aw * 2):
-                    ci, dx = cp // 2, cp % 2 
-                    si = int(cp * (len(s) - 1) / (aw * 2 - 1)) if len(s) > 1 else 0
-                    nv = (s[si] - min_v) / (max_v - min_v)
-                    rp = int(nv * (ah * 4 - 1))
-                    ri, dy = ah - 1 - (rp // 4), 3 - (rp % 4)
-                    if 0 <= ri < ah and 0 <= ci < aw: grid[ci][ri][dx * 4 + dy] = True
-            self._cached_grid = grid
+        if self._cached_grid is None or data_id != self._last_data_id or (ah, aw) != self._last_size or (min_v, max_v) != self._last_range:
+            self._cached_grid = self._build_rows(ah, aw, min_v, max_v)
             self._last_data_id = data_id
             self._last_size = (ah, aw)
-        
-        grid = self._cached_grid
-        for yo in range(ah):
-            for xo in range(aw):
-                dots = grid[xo][yo]
-                if any(dots):
-                    label = list(self.series_data.keys())[0] if self.series_data else ""
-                    color = self.color_pairs.get(label, 1)
-                    try: stdscr.addstr(ry + yo, rx + xo, self._get_braille_char(dots), curses.color_pair(color))
-                    except curses.error: pass
+            self._last_range = (min_v, max_v)
+
+        for yo, runs in enumerate(self._cached_grid):
+            for xo, text, label in runs:
+                try: stdscr.addstr(ry + yo, rx + xo, text, resolve(self._series_color(label)))
+                except curses.error: pass
@@ -0,0 +1,17 @@
+import random
+
+from lokutui import raster
+from lokutui.series import ChartSeries
+
+
+def test_series_bucket_extents_match_a_full_scan(monkeypatch):
+    monkeypatch.setattr(raster, 'np', None)
+    rng = random.Random(3)
+    for capacity in (5, 64, 65, 1000, 5000):
+        series = ChartSeries(capacity)
+        for _ in range(capacity * 5 // 2):
+            series.append(float('nan') if rng.random() < 0.05 else rng.uniform(-50, 50))
+            if rng.random() < 0.01:
+                columns = rng.choice((1, 3, 40, 120))
+                expected = raster._extents_array(series.values(), len(series), columns, -50, 50, 40)
+                assert raster.column_extents(series, columns, -50, 50, 40) == expected
@@ -0,0 +1,12 @@
+from lokutui import LogDisplay
+
+
+def test_search_without_scrollback_forgets_dropped_matches():
+    log = LogDisplay(max_messages=100)
+    log.search('hit')
+    for i in range(10_000):
+        log.add_message(f'hit {i}')
+    assert log.match_count == 100
+    assert len(log._searches[-1].matches) <= 200
+    matches, first = log._valid_matches()
+    assert matches[first] == log._first_line
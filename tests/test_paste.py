@@ -0,0 +1,88 @@
+from lokutui import Screen, HeadlessBackend, TextInput
+from lokutui import core
+
+
+def _screen() -> tuple[Screen, HeadlessBackend, TextInput]:
+    backend = HeadlessBackend(10, 40)
+    screen = Screen(backend=backend)
+    field = TextInput(width=30)
+    screen.add_widget(field)
+    screen.focus_manager.focus(field)
+    return screen, backend, field
+
+
+def test_paste_end_marker_split_after_esc():
+    screen, backend, field = _screen()
+    backend.feed('\x1b[200~hello\x1b')
+    screen.step()
+    screen.step()
+    backend.feed('[201~')
+    screen.step()
+    backend.feed('abc')
+    screen.step()
+    assert screen._paste is None
+    assert field.text == 'helloabc'
+    screen.stop()
+
+
+def test_paste_end_marker_split_mid_sequence():
+    screen, backend, field = _screen()
+    backend.feed('\x1b[200~hi\x1b[20')
+    screen.step()
+    screen.step()
+    backend.feed('1~x')
+    screen.step()
+    assert screen._paste is None
+    assert field.text == 'hix'
+    screen.stop()
+
+
+def test_start_marker_split():
+    screen, backend, field = _screen()
+    backend.feed('\x1b[2')
+    screen.step()
+    backend.feed('00~pasted\x1b[201~')
+    screen.step()
+    assert field.text == 'pasted'
+    screen.stop()
+
+
+def _keys_screen(monkeypatch) -> tuple[Screen, HeadlessBackend, list[str]]:
+    backend = HeadlessBackend(10, 40)
+    screen = Screen(backend=backend)
+    monkeypatch.setattr(screen.event_dispatcher, 'handlers', {})
+    typed = []
+    screen.event_dispatcher.register_handler('key', lambda event: typed.append(event.data['char']))
+    return screen, backend, typed
+
+
+def test_unhandled_paste_arrives_as_keys(monkeypatch):
+    screen, backend, typed = _keys_screen(monkeypatch)
+    backend.feed('ab')
+    backend.paste('PASTED')
+    backend.feed('c')
+    screen.step()
+    assert ''.join(typed) == 'abPASTEDc'
+    screen.stop()
+
+
+def test_paste_handler_gets_the_paste_whole(monkeypatch):
+    screen, backend, typed = _keys_screen(monkeypatch)
+    pasted = []
+    screen.event_dispatcher.register_handler('paste', lambda event: pasted.append(event.data['text']))
+    backend.paste('PASTED')
+    screen.step()
+    assert pasted == ['PASTED'] and typed == []
+    screen.stop()
+
+
+def test_partial_start_marker_does_not_block_the_event_loop(monkeypatch):
+    screen, backend, typed = _keys_screen(monkeypatch)
+    backend.feed('\x1b[')
+    screen.step()
+    assert screen._key_backlog
+    timeout = screen._next_timeout(0.016)
+    assert timeout is not None and timeout <= core._MARKER_WAIT
+    screen.step()
+    assert not screen._key_backlog and len(typed) == 2
+    screen.stop()
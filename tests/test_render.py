@@ -0,0 +1,139 @@
+import random
+
+from lokutui import Screen, HeadlessBackend, Chart, Label, Box, Button, Checkbox, TextInput, VStack, HStack
+
+
+def _screen(*widgets, height=20, width=60):
+    backend = HeadlessBackend(height, width)
+    screen = Screen(backend=backend)
+    for widget in widgets:
+        screen.add_widget(widget)
+    screen.step()
+    return screen, backend
+
+
+def _frame(backend):
+    terminal = backend.terminal
+    return [terminal.styled_row(y) for y in range(terminal.height)], terminal.cursor
+
+
+def _assert_matches_full_redraw(screen, backend):
+    incremental = _frame(backend)
+    screen.refresh()
+    screen.step()
+    assert incremental == _frame(backend)
+
+
+def test_repaint_keeps_widgets_above_damage():
+    chart = Chart(0, 0, 30, 8)
+    chart.add_point('a', 1.0)
+    chart.add_point('a', 2.0)
+    label = Label('x', 10, 5)
+    screen, backend = _screen(chart, Label('OVERLAY', 2, 3), label)
+    label.text = 'y'
+    screen.step()
+    assert 'OVERLAY' in backend.snapshot()[3]
+    _assert_matches_full_redraw(screen, backend)
+    screen.stop()
+
+
+def test_random_updates_match_full_redraw():
+    rng = random.Random(7)
+    labels = [Label(f'label {i}', rng.randrange(40), rng.randrange(16)) for i in range(8)]
+    boxes = [Box(rng.randrange(40), rng.randrange(12), rng.randrange(3, 15), rng.randrange(3, 6)) for _ in range(3)]
+    stack = VStack([Label(f'row {i}') for i in range(4)] + [HStack([Button('ok'), Button('cancel')])], 5, 4)
+    checks = [Checkbox(f'opt {i}', rng.randrange(40), rng.randrange(18)) for i in range(3)]
+    field = TextInput('typed', 20, 9, width=12)
+    widgets = boxes[:1] + labels[:4] + [stack] + boxes[1:] + labels[4:] + checks + [field]
+    rng.shuffle(widgets)
+    screen, backend = _screen(*widgets)
+    screen.focus_manager.focus(field)
+    for _ in range(200):
+        widget = rng.choice(labels + boxes + checks + stack.widgets[:4])
+        change = rng.random()
+        if change < 0.3:
+            widget.x, widget.y = rng.randrange(45), rng.randrange(18)
+        elif change < 0.5:
+            widget.visible = not widget.visible
+        elif isinstance(widget, Label):
+            widget.text = 'z' * rng.randrange(1, 14)
+        elif isinstance(widget, Checkbox):
+            widget.label = 'c' * rng.randrange(1, 14)
+        else:
+            widget.width = rng.randrange(3, 15)
+        screen.step()
+        _assert_matches_full_redraw(screen, backend)
+    screen.stop()
+
+
+def test_checkbox_and_button_bounds_follow_their_label():
+    checkbox = Checkbox('short', 0, 0)
+    button = Button('go', 0, 2)
+    screen, backend = _screen(checkbox, button)
+    checkbox.label = 'a much longer label'
+    button._label = 'a much longer caption'
+    screen.step()
+    checkbox.label = 'b'
+    button._label = 'c'
+    screen.step()
+    assert backend.snapshot()[0].rstrip() == '[ ] b'
+    assert backend.snapshot()[2].strip() == 'c'
+    _assert_matches_full_redraw(screen, backend)
+    screen.stop()
+
+
+def test_partial_frame_keeps_the_focused_cursor():
+    status = Label('idle', 0, 8)
+    field = TextInput('abc', 0, 2, width=10)
+    screen, backend = _screen(status, field)
+    screen.focus_manager.focus(field)
+    screen.step()
+    assert backend.terminal.cursor == (2, 3)
+    status.text = 'saving...'
+    screen.step()
+    assert backend.terminal.cursor == (2, 3)
+    screen.stop()
+
+
+def test_headless_terminal_counts_frames():
+    label = Label('a', 0, 0)
+    screen, backend = _screen(label)
+    frames = backend.terminal.frames
+    assert frames >= 1
+    label.text = 'b'
+    screen.step()
+    assert backend.terminal.frames == frames + 1
+    screen.stop()
+
+
+def test_shrinking_widget_uncovers_what_was_below():
+    box = Box(0, 0, 20, 5)
+    label = Label('a long status line', 0, 2)
+    screen, backend = _screen(box, label)
+    label.text = 'ok'
+    screen.step()
+    assert backend.snapshot()[2][19] != ' '
+    _assert_matches_full_redraw(screen, backend)
+    screen.stop()
+
+
+def test_moved_widget_leaves_nothing_behind():
+    label = Label('moving', 3, 3)
+    screen, backend = _screen(Label('still', 0, 0), label)
+    label.x, label.y = 10, 6
+    screen.step()
+    assert 'moving' not in backend.snapshot()[3]
+    assert backend.terminal.find('moving') == (6, 10)
+    _assert_matches_full_redraw(screen, backend)
+    screen.stop()
+
+
+def test_stack_repaint_keeps_later_siblings_drawn_over_it():
+    first = Label('first')
+    stack = VStack([first, Label('second')], 0, 0)
+    screen, backend = _screen(stack, Label('OVER', 0, 1))
+    first.text = 'changed'
+    screen.step()
+    assert backend.snapshot()[1].startswith('OVER')
+    _assert_matches_full_redraw(screen, backend)
+    screen.stop()
@@ -0,0 +1,45 @@
+import os
+import select
+
+from lokutui import Screen, HeadlessBackend, CustomEvent
+from lokutui import core, events
+
+
+def _readable(fd: int) -> bool:
+    return bool(select.select([fd], [], [], 0)[0])
+
+
+def test_post_during_drain_is_not_lost(monkeypatch):
+    screen = Screen(backend=HeadlessBackend(5, 20))
+    screen.start()
+    screen._init_event_loop()
+    try:
+        dispatcher = screen.event_dispatcher
+        received = []
+        dispatcher.register_handler('ping', lambda event: received.append(event))
+        dispatcher.post_threadsafe(CustomEvent('ping'))
+        fd = screen._wakeup_fds[0]
+        assert _readable(fd)
+
+        # A worker posts right after the pipe has been read, before the flag is cleared.
+        real_read = os.read
+
+        def read_then_post(descriptor, size):
+            data = real_read(descriptor, size)
+            if data:
+                dispatcher.post_threadsafe(CustomEvent('ping'))
+            return data
+
+        monkeypatch.setattr(core.os, 'read', read_then_post)
+        screen._drain_wakeup()
+        monkeypatch.setattr(core.os, 'read', real_read)
+
+        assert not events._wakeup_pending
+        screen._process_events()
+        assert len(received) == 2
+
+        dispatcher.post_threadsafe(CustomEvent('ping'))
+        assert _readable(fd)
+    finally:
+        screen._close_event_loop()
+        screen.stop()